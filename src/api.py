@@ -147,7 +147,7 @@ from score_engine import register_score_routes
 from scoring_config import register_config_routes
 from stats_api import register_stats_routes
 from jobs_engine import register_jobs_routes
-from event_logger import register_events_routes
+from event_logger import register_events_routes, shutdown_events
 from admin_auth import register_admin_routes as register_admin_auth_routes
 from government_api import register_government_routes
 from external_data_api import register_external_data_routes
@@ -179,6 +179,14 @@ register_wildlife_routes(app)
 register_climate_routes(app)
 
 
+from supabase_reader import SupabaseReadError
+
+@app.errorhandler(SupabaseReadError)
+def supabase_read_error(e):
+    """A paged read failed part way - report it rather than serve partial data."""
+    return jsonify({"error": "Upstream read failed", "detail": str(e)}), 502
+
+
 # =============================================================================
 # RUN SERVER
 # =============================================================================
@@ -252,27 +260,32 @@ def map_observations():
     GET /api/map/observations
     GET /api/map/observations?status=confirmed
     GET /api/map/observations?city=Murray
+    GET /api/map/observations?bounds=minLng,minLat,maxLng,maxLat
     """
     import asyncio
     from observations import get_observations
+    from map_grid_cache import parse_bounds
     
     status = request.args.get('status')
     city = request.args.get('city')
+    bbox = parse_bounds(request.args.get('bounds'))
     limit = request.args.get('limit', 500, type=int)
     
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     try:
-        result = loop.run_until_complete(get_observations(status=status, limit=limit))
+        # Filters are applied in the query so pages are always full
+        result = loop.run_until_complete(get_observations(
+            status=status,
+            city=city,
+            bbox=bbox,
+            limit=limit,
+        ))
     finally:
         loop.close()
     
     observations = result.get('observations', [])
     
-    # Filter by city if specified
-    if city:
-        observations = [o for o in observations if o.get('city') == city]
-    
     # Convert to GeoJSON
     features = []
     for obs in observations:
@@ -370,76 +383,46 @@ def map_properties():
     Combines leaderboard scores + observation counts.
     
     GET /api/map/properties
+    GET /api/map/properties?city=Murray&status=confirmed
+    GET /api/map/properties?bounds=minLng,minLat,maxLng,maxLat
     """
     import asyncio
-    from database import get_leaderboard
-    from observations import get_observations
+    from map_grid_cache import get_grid_rows, parse_bounds
+    
+    city = request.args.get('city')
+    status = request.args.get('status')
+    bbox = parse_bounds(request.args.get('bounds'))
     
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    
     try:
-        # Get all leaderboard entries
-        lb_result = loop.run_until_complete(get_leaderboard(level='state', limit=500))
-        lb_entries = {e.get('grid_hash'): e for e in lb_result.get('entries', [])}
-        
-        # Get all observations and count by grid_hash
-        obs_result = loop.run_until_complete(get_observations(limit=1000))
-        obs_by_grid = {}
-        for obs in obs_result.get('observations', []):
-            gh = obs.get('grid_hash')
-            if gh not in obs_by_grid:
-                obs_by_grid[gh] = {'count': 0, 'species': set(), 'september': 0}
-            obs_by_grid[gh]['count'] += 1
-            if obs.get('species_guess'):
-                obs_by_grid[gh]['species'].add(obs['species_guess'])
-            # Check if September observation
-            observed_at = obs.get('observed_at', '')
-            if observed_at and '-09-' in observed_at:
-                obs_by_grid[gh]['september'] += 1
+        rows = loop.run_until_complete(get_grid_rows(city=city, status=status, bbox=bbox))
     finally:
         loop.close()
     
-    # Merge data
-    all_grids = set(lb_entries.keys()) | set(obs_by_grid.keys())
-    
     features = []
-    for grid_hash in all_grids:
-        lb = lb_entries.get(grid_hash, {})
-        obs = obs_by_grid.get(grid_hash, {'count': 0, 'species': set(), 'september': 0})
-        
-        # Get coordinates from either source
-        lat = lb.get('lat')
-        lng = lb.get('lng')
-        
-        if not lat or not lng:
-            # Parse from grid_hash: "40.666_-111.897"
-            try:
-                parts = grid_hash.split('_')
-                lat = float(parts[0])
-                lng = float(parts[1])
-            except:
-                continue
+    for row in rows:
+        lb = row['leaderboard'] or {}
         
         features.append({
             "type": "Feature",
             "geometry": {
                 "type": "Point",
-                "coordinates": [lng, lat]
+                "coordinates": [row['lng'], row['lat']]
             },
             "properties": {
-                "grid_hash": grid_hash,
+                "grid_hash": row['grid_hash'],
                 "display_name": lb.get('display_name', 'Unknown'),
                 "score": lb.get('score', 0),
                 "grade": lb.get('grade', 'N/A'),
                 "identity_level": lb.get('identity_level', 'seedling'),
                 "city": lb.get('city'),
                 "ward": lb.get('ward'),
-                "observation_count": obs['count'],
-                "species_count": len(obs['species']),
-                "september_count": obs['september'],
+                "observation_count": row['observation_count'],
+                "species_count": row['species_count'],
+                "september_count": row['september_count'],
                 "has_score": bool(lb),
-                "has_observations": obs['count'] > 0,
+                "has_observations": row['observation_count'] > 0,
             }
         })
     
@@ -1250,6 +1233,12 @@ def download_info():
 
 # ============ iNaturalist Sync ============
 
+from inat_proxy import (
+    search_users as search_inaturalist_users,
+    sync_observations as sync_inaturalist_observations,
+    get_updated_observations as get_updated_inaturalist_observations,
+)
+
 @app.route('/api/inaturalist/search', methods=['GET'])
 def search_inaturalist_user():
     """Search for iNaturalist user by username"""
@@ -1258,81 +1247,40 @@ def search_inaturalist_user():
         return jsonify({'error': 'Username required'}), 400
     
     try:
-        # Search for user
-        url = f"https://api.inaturalist.org/v1/users/autocomplete?q={username}"
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        
-        users = []
-        for user in data.get('results', [])[:5]:
-            users.append({
-                'id': user.get('id'),
-                'login': user.get('login'),
-                'name': user.get('name', ''),
-                'icon': user.get('icon'),
-                'observations_count': user.get('observations_count', 0)
-            })
-        
-        return jsonify({'users': users})
+        return jsonify({'users': search_inaturalist_users(username)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/inaturalist/observations', methods=['GET'])
 def get_inaturalist_observations():
-    """Fetch observations for a user, optionally filtered by location"""
+    """
+    Fetch observations for a user, optionally filtered by location.
+    Pass updated_since (the synced_at of a previous response) to only
+    get observations created or edited since then.
+    """
     username = request.args.get('username', '')
     lat = request.args.get('lat', type=float)
     lng = request.args.get('lng', type=float)
     radius_km = request.args.get('radius', 1, type=float)  # Default 1km
+    updated_since = request.args.get('updated_since')
     
     if not username:
         return jsonify({'error': 'Username required'}), 400
     
+    if not (lat and lng):
+        lat = lng = None
+    
     try:
-        params = {
-            'user_login': username,
-            'per_page': 200,
-            'order': 'desc',
-            'order_by': 'observed_on',
-            'quality_grade': 'research,needs_id',
-            'iconic_taxa': 'Insecta,Aves,Plantae,Mammalia,Reptilia,Amphibia,Arachnida,Fungi'
-        }
-        
-        # Add location filter if provided
-        if lat and lng:
-            params['lat'] = lat
-            params['lng'] = lng
-            params['radius'] = radius_km
-        
-        url = "https://api.inaturalist.org/v1/observations"
-        response = requests.get(url, params=params, timeout=30)
-        data = response.json()
-        
-        observations = []
-        for obs in data.get('results', []):
-            if not obs.get('geojson'):
-                continue
-                
-            taxon = obs.get('taxon', {})
-            photos = obs.get('photos', [])
-            
-            observations.append({
-                'id': obs.get('id'),
-                'species': taxon.get('preferred_common_name') or taxon.get('name', 'Unknown'),
-                'scientific_name': taxon.get('name', ''),
-                'iconic_taxon': taxon.get('iconic_taxon_name', 'Other'),
-                'observed_on': obs.get('observed_on'),
-                'place_guess': obs.get('place_guess', ''),
-                'quality_grade': obs.get('quality_grade'),
-                'coordinates': obs.get('geojson', {}).get('coordinates', []),
-                'photo_url': photos[0].get('url', '').replace('square', 'medium') if photos else None,
-                'url': f"https://www.inaturalist.org/observations/{obs.get('id')}"
-            })
+        if updated_since:
+            result = get_updated_inaturalist_observations(username, lat, lng, radius_km, updated_since)
+        else:
+            result = sync_inaturalist_observations(username, lat, lng, radius_km)
         
         return jsonify({
-            'total': data.get('total_results', 0),
-            'observations': observations,
-            'username': username
+            'total': result['total'],
+            'observations': result['observations'],
+            'username': username,
+            'synced_at': result['synced_at']
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1375,7 +1323,11 @@ if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     get_engine()
     print(f"\n  Utah Pollinator Path API running on http://localhost:{port}\n")
-    app.run(host='0.0.0.0', port=port, debug=True)
+    try:
+        app.run(host='0.0.0.0', port=port, debug=True)
+    finally:
+        # Write out buffered events while the event loop machinery still works
+        shutdown_events()
 
 # =============================================================================
 # CACHED WILDLIFE DATA (105k+ observations)
@@ -0,0 +1,333 @@
+"""
+Boundary Lookup
+================
+Ward / city / ZIP resolution from local GeoJSON polygons.
+
+Polygons are read from data/boundaries/{wards,cities,zips}.geojson
+(or BOUNDARY_DIR) into a bounding-box R-tree; candidates are then
+confirmed with point-in-polygon. Results are memoized per grid_hash.
+Layers without a file fall back to the legacy latitude-band rules.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+BOUNDARY_DIR = os.environ.get(
+    "BOUNDARY_DIR",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'boundaries'),
+)
+
+LAYER_FILES = {
+    "ward": "wards.geojson",
+    "city": "cities.geojson",
+    "zip": "zips.geojson",
+}
+
+# Feature properties tried, in order, for each layer's name
+NAME_KEYS = {
+    "ward": ("ward", "name", "NAME", "DISTRICT"),
+    "city": ("city", "name", "NAME", "NAMELSAD"),
+    "zip": ("zip", "zip_code", "ZCTA5CE20", "ZCTA5CE10", "ZIP5", "name"),
+}
+
+# Value when a loaded layer has no polygon containing the point
+LAYER_DEFAULTS = {
+    "ward": "Unknown",
+    "city": "Salt Lake County",
+    "zip": None,
+}
+
+NODE_SIZE = 16
+# Grid cells memoized (least recently used dropped first); lookups take arbitrary points
+GRID_MEMO_MAX = 50000
+
+_layers = {}  # layer -> _RTree (only layers with a file)
+_grid_memo = OrderedDict()  # grid_hash -> {"ward", "city", "zip", "resolved"}
+_lock = threading.Lock()
+_loaded = False
+_stats = {"hits": 0, "misses": 0, "polygons": {}, "version": 0}
+
+
+# ============ GEOMETRY ============
+
+def _ring_contains(ring, x, y):
+    """Ray casting test for one linear ring of [x, y] positions."""
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _polygon_contains(rings, x, y):
+    """Inside the outer ring and outside every hole."""
+    if not rings or not _ring_contains(rings[0], x, y):
+        return False
+    return not any(_ring_contains(hole, x, y) for hole in rings[1:])
+
+
+def _geometry_polygons(geometry):
+    """List of polygons (each a list of rings) from a Polygon/MultiPolygon."""
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        return [geometry.get("coordinates", [])]
+    if geometry.get("type") == "MultiPolygon":
+        return geometry.get("coordinates", [])
+    return []
+
+
+def _bbox(polygon):
+    xs = [p[0] for p in polygon[0]]
+    ys = [p[1] for p in polygon[0]]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _union(boxes):
+    return (
+        min(b[0] for b in boxes), min(b[1] for b in boxes),
+        max(b[2] for b in boxes), max(b[3] for b in boxes),
+    )
+
+
+class _RTree:
+    """
+    Static bounding-box R-tree, bulk-loaded with Sort-Tile-Recursive packing.
+    Entries are (bbox, polygon_rings, name).
+    """
+
+    def __init__(self, entries, node_size=NODE_SIZE):
+        self.size = len(entries)
+        # Nodes are (bbox, children, entry); leaves have children=None
+        level = [(e[0], None, e) for e in entries]
+        while len(level) > node_size:
+            level = self._pack(level, node_size)
+        self.root = (_union([n[0] for n in level]), level, None) if level else None
+
+    @staticmethod
+    def _pack(nodes, node_size):
+        parent_count = -(-len(nodes) // node_size)
+        slabs = max(1, int(parent_count ** 0.5 + 0.5))
+        per_slab = -(-len(nodes) // slabs)
+        nodes = sorted(nodes, key=lambda n: n[0][0] + n[0][2])
+        parents = []
+        for s in range(0, len(nodes), per_slab):
+            slab = sorted(nodes[s:s + per_slab], key=lambda n: n[0][1] + n[0][3])
+            for c in range(0, len(slab), node_size):
+                children = slab[c:c + node_size]
+                parents.append((_union([n[0] for n in children]), children, None))
+        return parents
+
+    def find(self, x, y):
+        """Name of the first polygon containing (x, y), or None."""
+        if self.root is None:
+            return None
+        stack = [self.root]
+        while stack:
+            box, children, entry = stack.pop()
+            if not (box[0] <= x <= box[2] and box[1] <= y <= box[3]):
+                continue
+            if children is None:
+                if _polygon_contains(entry[1], x, y):
+                    return entry[2]
+            else:
+                stack.extend(children)
+        return None
+
+
+# ============ LOADING ============
+
+def _feature_name(properties, layer):
+    for key in NAME_KEYS[layer]:
+        value = (properties or {}).get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def _load_layer(path, layer):
+    with open(path, 'r') as f:
+        data = json.load(f)
+    entries = []
+    for feature in data.get("features", []):
+        name = _feature_name(feature.get("properties"), layer)
+        if not name:
+            continue
+        for polygon in _geometry_polygons(feature.get("geometry")):
+            if polygon and polygon[0]:
+                entries.append((_bbox(polygon), polygon, name))
+    return _RTree(entries)
+
+
+def load_boundaries(directory=None):
+    """(Re)load every boundary layer found in directory."""
+    global _layers, _loaded
+    directory = directory or BOUNDARY_DIR
+    layers = {}
+    for layer, filename in LAYER_FILES.items():
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            continue
+        try:
+            layers[layer] = _load_layer(path, layer)
+        except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+            print(f"Boundary layer {filename} failed to load: {e}")
+    with _lock:
+        _layers = layers
+        _grid_memo.clear()
+        _stats["polygons"] = {layer: tree.size for layer, tree in layers.items()}
+        _stats["version"] += 1
+        _loaded = True
+    return _stats["polygons"]
+
+
+def _ensure_loaded():
+    if not _loaded:
+        load_boundaries()
+
+
+# ============ LEGACY RULES ============
+
+def _band_ward(lat, lng):
+    """Simplified Murray ward mapping based on lat ranges."""
+    if lat >= 40.68:
+        return "Murray North"
+    elif lat >= 40.66:
+        return "Murray Central"
+    elif lat >= 40.64:
+        return "Murray South"
+    return "South Valley"
+
+
+def _band_city(lat, lng):
+    """Simplified - Murray boundaries roughly."""
+    if 40.62 <= lat <= 40.70 and -111.92 <= lng <= -111.85:
+        return "Murray"
+    return "Salt Lake County"
+
+
+_FALLBACKS = {
+    "ward": _band_ward,
+    "city": _band_city,
+    "zip": lambda lat, lng: None,
+}
+
+
+# ============ LOOKUP ============
+
+def lookup_point(lat, lng, layers=None):
+    """
+    Resolve ward, city and zip for one point (not memoized).
+    `resolved` lists the layers answered by an actual polygon.
+    """
+    _ensure_loaded()
+    if lat is None or lng is None:
+        return {"ward": "Unknown", "city": "Unknown", "zip": None, "resolved": []}
+    layers = _layers if layers is None else layers
+    result = {"resolved": []}
+    for layer in LAYER_FILES:
+        tree = layers.get(layer)
+        if tree is None:
+            result[layer] = _FALLBACKS[layer](lat, lng)
+            continue
+        name = tree.find(lng, lat)
+        if name is None:
+            result[layer] = LAYER_DEFAULTS[layer]
+        else:
+            result[layer] = name
+            result["resolved"].append(layer)
+    return result
+
+
+def grid_hash_for(lat, lng):
+    return f"{round(lat, 3)}_{round(lng, 3)}"
+
+
+def lookup_grid(grid_hash):
+    """Resolve ward, city and zip for a grid cell, memoized per grid_hash."""
+    _ensure_loaded()
+    with _lock:
+        cached = _grid_memo.get(grid_hash)
+        if cached is not None:
+            _grid_memo.move_to_end(grid_hash)
+            _stats["hits"] += 1
+            return cached
+        _stats["misses"] += 1
+        # Resolve against one consistent set of layers
+        layers, version = _layers, _stats["version"]
+    try:
+        lat, lng = grid_hash.split('_')
+        result = lookup_point(float(lat), float(lng), layers)
+    except (AttributeError, ValueError):
+        result = lookup_point(None, None)
+    with _lock:
+        # A reload since we started would make this result stale - don't keep it
+        if _stats["version"] == version:
+            _grid_memo[grid_hash] = result
+            while len(_grid_memo) > GRID_MEMO_MAX:
+                _grid_memo.popitem(last=False)
+    return result
+
+
+def lookup_many(points):
+    """
+    Resolve many (lat, lng) points at once.
+    Points are bucketed by grid_hash so each cell is resolved only once.
+    Returns results in the same order as points.
+    """
+    cells = {}
+    keys = []
+    for lat, lng in points:
+        key = grid_hash_for(lat, lng) if lat is not None and lng is not None else None
+        keys.append(key)
+        if key is not None and key not in cells:
+            cells[key] = lookup_grid(key)
+    unknown = lookup_point(None, None)
+    return [cells[key] if key is not None else unknown for key in keys]
+
+
+def polygon_area(grid_hash):
+    """
+    Ward/city/zip for a grid cell, only where an actual polygon matched
+    (None otherwise), so callers can prefer it over other sources.
+    """
+    result = lookup_grid(grid_hash)
+    return {layer: result[layer] if layer in result["resolved"] else None for layer in LAYER_FILES}
+
+
+def ward_for(lat, lng):
+    if lat is None or lng is None:
+        return "Unknown"
+    return lookup_grid(grid_hash_for(lat, lng))["ward"]
+
+
+def city_for(lat, lng):
+    if lat is None or lng is None:
+        return "Unknown"
+    return lookup_grid(grid_hash_for(lat, lng))["city"]
+
+
+def get_boundary_version():
+    """Bumped on every (re)load so cached aggregates can tell boundaries changed."""
+    _ensure_loaded()
+    return _stats["version"]
+
+
+def get_boundary_stats():
+    """Return loaded layers and memo statistics."""
+    _ensure_loaded()
+    return {
+        "version": _stats["version"],
+        "directory": os.path.abspath(BOUNDARY_DIR),
+        "layers": _stats["polygons"],
+        "fallback_layers": [layer for layer in LAYER_FILES if layer not in _layers],
+        "memoized_grids": len(_grid_memo),
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+    }
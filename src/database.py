@@ -7,7 +7,7 @@ Uses REST API directly - no extra dependencies.
 import aiohttp
 import ssl
 import certifi
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Supabase credentials
 SUPABASE_URL = "https://gqexnqmqwhpcrleksrkb.supabase.co"
@@ -79,10 +79,16 @@ async def get_leaderboard(
     level: str = "state",
     filter_value: Optional[str] = None,
     limit: int = 20,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    select: str = "*",
 ) -> Dict:
-    """Get leaderboard for a specific level."""
+    """
+    Get leaderboard for a specific level.
     
-    url = f"{SUPABASE_URL}/rest/v1/{TABLE}?select=*&order=score.desc&limit={limit}"
+    bbox is (min_lng, min_lat, max_lng, max_lat) and is filtered server-side.
+    """
+    
+    url = f"{SUPABASE_URL}/rest/v1/{TABLE}?select={select}&order=score.desc&limit={limit}"
     
     # Apply filter
     if level == "state":
@@ -96,6 +102,10 @@ async def get_leaderboard(
     elif level == "ward" and filter_value:
         url += f"&ward=eq.{filter_value}"
     
+    if bbox:
+        min_lng, min_lat, max_lng, max_lat = bbox
+        url += f"&lat=gte.{min_lat}&lat=lte.{max_lat}&lng=gte.{min_lng}&lng=lte.{max_lng}"
+    
     connector = aiohttp.TCPConnector(ssl=_ssl_context())
     async with aiohttp.ClientSession(connector=connector) as session:
         async with session.get(url, headers=_headers()) as resp:
@@ -0,0 +1,354 @@
+"""
+Streaming Export
+=================
+Pages through tables and streams NDJSON, CSV or JSON (optionally gzipped)
+straight to the response, or to a local file for large jobs.
+Only one page is held in memory; every export can resume from a keyset
+cursor (the order key of the last row written).
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime
+
+from flask import Response, stream_with_context
+
+from supabase_reader import iter_pages, iter_pages_keyset, keyset_cursor
+
+EXPORT_TABLES = [
+    'plant_inventories', 'species', 'habitat_assessments',
+    'observations', 'challenges', 'challenge_participants',
+    'referrals', 'user_badges', 'user_scores', 'score_history'
+]
+
+EXPORT_FORMATS = ("json", "ndjson", "csv")
+
+EXPORT_DIR = os.environ.get(
+    "EXPORT_DIR",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'exports'),
+)
+
+MIMETYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# job_id -> status dict (checkpoints on disk survive restarts)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+# ============ PAGING ============
+
+def drive(agen):
+    """Iterate an async generator from sync code (e.g. a Flask response) on a private loop."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(agen.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(agen.aclose())
+        loop.close()
+
+
+async def iter_table_pages(tables, start_table=None, after=None, order="id", transform=None, offset=None):
+    """
+    Yield (table, cursor, rows) for each page of each table, where cursor
+    is the keyset position of the page's last row (see iter_pages_keyset).
+    Tables before start_table are skipped; `after` resumes the first table
+    read past that cursor. A legacy `offset` pages the first table by
+    position instead, which can skip or repeat rows if the table changes.
+    """
+    if start_table in tables:
+        tables = tables[tables.index(start_table):]
+    for i, table in enumerate(tables):
+        if i == 0 and offset:
+            pages = iter_pages(table, order=order, offset=offset)
+        else:
+            pages = iter_pages_keyset(table, key=order, after=after if i == 0 else None)
+        async for rows in pages:
+            cursor = keyset_cursor(rows[-1], order)
+            if transform:
+                rows = [transform(row) for row in rows]
+            yield table, cursor, rows
+
+
+# ============ ENCODING ============
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class _CsvEncoder:
+    """CSV encoder whose header comes from the first row it sees."""
+
+    def __init__(self, write_header=True):
+        self.fields = None
+        self.write_header = write_header
+
+    def encode(self, rows):
+        if not rows:
+            return ""
+        buf = io.StringIO()
+        if self.fields is None:
+            self.fields = list(rows[0].keys())
+            writer = csv.DictWriter(buf, fieldnames=self.fields, extrasaction='ignore', restval='')
+            if self.write_header:
+                writer.writeheader()
+        else:
+            writer = csv.DictWriter(buf, fieldnames=self.fields, extrasaction='ignore', restval='')
+        for row in rows:
+            writer.writerow({k: _cell(v) for k, v in row.items()})
+        return buf.getvalue()
+
+
+def encode_ndjson(rows, table=None):
+    """One JSON object per line; tagged with _table for multi-table exports."""
+    if table:
+        return "".join(json.dumps({"_table": table, **row}, default=str) + "\n" for row in rows)
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks incrementally."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def text_chunks(pages, fmt, multi_table=False):
+    """Encode (table, cursor, rows) pages as NDJSON or CSV text chunks."""
+    csv_encoder = _CsvEncoder()
+    for table, _, rows in pages:
+        if fmt == "csv":
+            yield csv_encoder.encode(rows)
+        else:
+            yield encode_ndjson(rows, table if multi_table else None)
+
+
+def json_records_chunks(head, pages, records_key="records", count_key="record_count"):
+    """
+    Stream a JSON document: head fields, then records_key as an array,
+    with the count and the cursor of the last record (pass it back as
+    `after` to continue) written once they are known.
+    """
+    yield json.dumps(head)[:-1] + (", " if head else "") + f'"{records_key}": ['
+    count = 0
+    cursor = None
+    for _, cursor, rows in pages:
+        for row in rows:
+            yield ("," if count else "") + json.dumps(row, default=str)
+            count += 1
+    yield f'], "{count_key}": {count}, "next_after": {json.dumps(cursor, default=str)}}}'
+
+
+def json_tables_chunks(head, pages, tables):
+    """
+    Stream {...head, "data": {"table": [rows...], ...}} one page at a time.
+    Every table in tables gets a key, even when it has no rows.
+    """
+    yield json.dumps(head)[:-1] + (", " if head else "") + '"data": {'
+    remaining = list(tables)
+    opened = False
+    first_row = True
+
+    def open_until(table):
+        # Close the current array and open arrays up to (and including) table
+        parts = []
+        nonlocal opened
+        while remaining:
+            name = remaining.pop(0)
+            parts.append(("], " if opened else "") + json.dumps(name) + ": [")
+            opened = True
+            if name == table:
+                break
+        return "".join(parts)
+
+    for table, _, rows in pages:
+        if table in remaining:
+            yield open_until(table)
+            first_row = True
+        for row in rows:
+            yield ("" if first_row else ",") + json.dumps(row, default=str)
+            first_row = False
+    yield open_until(None) + ("]" if opened else "") + "}}"
+
+
+def export_response(chunks, fmt, filename, compress=False):
+    """Wrap text chunks in a streaming Flask response."""
+    body = gzip_chunks(chunks) if compress else (c.encode() for c in chunks)
+    if compress:
+        filename += ".gz"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    mimetype = "application/gzip" if compress else MIMETYPES[fmt]
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+
+def parse_export_args(args, default_format="json"):
+    """
+    Read format/gzip/after/offset/start_table query params. Returns (options, error).
+    `after` is a cursor from a previous export: a key value, or a JSON
+    array for a multi-column order.
+    """
+    fmt = args.get('format', default_format)
+    if fmt not in EXPORT_FORMATS:
+        return None, f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+    try:
+        offset = max(0, int(args.get('offset', 0)))
+    except ValueError:
+        return None, "offset must be an integer"
+    after = args.get('after')
+    if after is not None and after.startswith('['):
+        try:
+            after = json.loads(after)
+        except ValueError:
+            return None, "after must be a key value or a JSON array of key values"
+    return {
+        "format": fmt,
+        "gzip": args.get('gzip', '').lower() in ('1', 'true', 'yes'),
+        "after": after,
+        "offset": offset,
+        "start_table": args.get('start_table'),
+    }, None
+
+
+# ============ FILE JOBS ============
+
+def _job_paths(job_id, fmt, compress):
+    base = os.path.join(EXPORT_DIR, f"export_{job_id}.{fmt}")
+    data_path = base + (".gz" if compress else "")
+    return data_path, base + ".checkpoint.json"
+
+
+def _write_checkpoint(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _run_job(job):
+    """
+    Write pages to the job file. After each page the file is flushed and a
+    checkpoint records (table, cursor, bytes); a resumed job truncates any
+    partial page past the checkpoint and continues after the cursor, so
+    rows added or removed meanwhile never shift what is left to read. Gzipped
+    files are written one gzip member per page so every checkpoint falls
+    on a valid boundary.
+    """
+    data_path, checkpoint_path = _job_paths(job["job_id"], job["format"], job["gzip"])
+    tables = job["tables"]
+    multi = len(tables) > 1
+    csv_encoder = _CsvEncoder(write_header=job["bytes"] == 0)
+
+    try:
+        with open(data_path, 'ab') as f:
+            f.truncate(job["bytes"])
+            # Checkpoints from before cursors carry an offset instead
+            offset = job.get("offset") if job.get("cursor") is None else None
+            pages = drive(iter_table_pages(tables, job.get("table"), job.get("cursor"), offset=offset))
+            for table, cursor, rows in pages:
+                if job["format"] == "csv":
+                    text = csv_encoder.encode(rows)
+                else:
+                    text = encode_ndjson(rows, table if multi else None)
+                data = text.encode()
+                if job["gzip"]:
+                    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+                    data = compressor.compress(data) + compressor.flush()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                with _jobs_lock:
+                    job["table"] = table
+                    job["cursor"] = cursor
+                    job.pop("offset", None)
+                    job["rows"] += len(rows)
+                    job["bytes"] = f.tell()
+                    _write_checkpoint(checkpoint_path, job)
+        with _jobs_lock:
+            job["status"] = "complete"
+            job["finished_at"] = datetime.utcnow().isoformat()
+            _write_checkpoint(checkpoint_path, job)
+    except Exception as e:
+        with _jobs_lock:
+            job["status"] = "failed"
+            job["error"] = str(e)
+            _write_checkpoint(checkpoint_path, job)
+
+
+def start_export_job(tables=None, fmt="ndjson", compress=True):
+    """Start a background export of tables to a local file."""
+    job_id = uuid.uuid4().hex[:12]
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    data_path, checkpoint_path = _job_paths(job_id, fmt, compress)
+    job = {
+        "job_id": job_id,
+        "tables": tables or EXPORT_TABLES,
+        "format": fmt,
+        "gzip": compress,
+        "status": "running",
+        "table": None,
+        "cursor": None,
+        "rows": 0,
+        "bytes": 0,
+        "path": data_path,
+        "started_at": datetime.utcnow().isoformat(),
+    }
+    with _jobs_lock:
+        _jobs[job_id] = job
+        _write_checkpoint(checkpoint_path, job)
+    threading.Thread(target=_run_job, args=(job,), daemon=True).start()
+    return dict(job)
+
+
+def _find_checkpoint(job_id):
+    if not os.path.isdir(EXPORT_DIR):
+        return None
+    prefix = f"export_{job_id}."
+    for name in os.listdir(EXPORT_DIR):
+        if name.startswith(prefix) and name.endswith(".checkpoint.json"):
+            with open(os.path.join(EXPORT_DIR, name)) as f:
+                return json.load(f)
+    return None
+
+
+def get_export_job(job_id):
+    """Job status from memory, or from its checkpoint after a restart."""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job:
+            return dict(job)
+    job = _find_checkpoint(job_id)
+    if job and job.get("status") == "running":
+        job["status"] = "interrupted"
+    return job
+
+
+def resume_export_job(job_id):
+    """Continue an interrupted or failed job from its last checkpoint."""
+    job = get_export_job(job_id)
+    if not job:
+        return None
+    if job["status"] in ("running", "complete"):
+        return job
+    job.update({"status": "running", "error": None})
+    with _jobs_lock:
+        _jobs[job_id] = job
+    threading.Thread(target=_run_job, args=(job,), daemon=True).start()
+    return dict(job)
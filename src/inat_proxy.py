@@ -0,0 +1,284 @@
+"""
+iNaturalist Proxy
+==================
+Async, cached access to iNaturalist user search and observation sync.
+
+- Responses are cached with a TTL, keyed by username + location + radius
+- Concurrent identical requests share one upstream call (single-flight)
+- Observation sync is incremental: a refresh only asks iNaturalist for
+  observations updated since the last sync and merges them in; a full
+  refresh every FULL_REFRESH_INTERVAL drops observations deleted upstream
+- The cache is a bounded LRU; entries past MAX_STALE_AGE are evicted
+"""
+
+import aiohttp
+import asyncio
+import ssl
+import certifi
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+
+INAT_BASE = "https://api.inaturalist.org/v1"
+
+SEARCH_TIMEOUT = 8
+OBSERVATIONS_TIMEOUT = 15
+SEARCH_TTL = 3600  # 1 hour
+OBSERVATIONS_TTL = 600  # 10 minutes
+FULL_REFRESH_INTERVAL = 6 * 3600  # incremental syncs can't see deletions
+MAX_STALE_AGE = 24 * 3600  # how long an expired entry may still be served if upstream is down
+MAX_ENTRIES = 2000
+
+ICONIC_TAXA = "Insecta,Aves,Plantae,Mammalia,Reptilia,Amphibia,Arachnida,Fungi"
+
+# key -> {"value": ..., "timestamp": ...}, least recently used first
+_cache = OrderedDict()
+# key -> Future shared by every request waiting on the same upstream call
+_inflight = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "shared": 0, "stale_served": 0, "evicted": 0}
+
+
+def _ssl_context():
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def search_key(username):
+    return f"search:{username.strip().lower()}"
+
+
+def observations_key(username, lat=None, lng=None, radius_km=None):
+    """Cache key for a user's observations around an (optional) location."""
+    if lat is None or lng is None:
+        return f"obs:{username.strip().lower()}"
+    return f"obs:{username.strip().lower()}:{round(lat, 3)}_{round(lng, 3)}:{radius_km}"
+
+
+def _get_fresh(key, ttl):
+    entry = _cache.get(key)
+    if entry and time.time() - entry["timestamp"] < ttl:
+        _cache.move_to_end(key)
+        return entry["value"]
+    return None
+
+
+def _store(key, value):
+    """Insert under _lock, evicting entries too old to serve and then the least recently used."""
+    now = time.time()
+    _cache[key] = {"value": value, "timestamp": now}
+    _cache.move_to_end(key)
+    for old_key in [k for k, e in _cache.items() if now - e["timestamp"] > MAX_STALE_AGE]:
+        del _cache[old_key]
+        _stats["evicted"] += 1
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+        _stats["evicted"] += 1
+
+
+def _single_flight(key, ttl, fetch):
+    """
+    Return the cached value for key, or run fetch() exactly once for all
+    concurrent callers. fetch receives the stale entry (or None) so it can
+    refresh incrementally.
+    """
+    with _lock:
+        cached = _get_fresh(key, ttl)
+        if cached is not None:
+            _stats["hits"] += 1
+            return cached
+        waiter = _inflight.get(key)
+        leader = waiter is None
+        if leader:
+            waiter = Future()
+            _inflight[key] = waiter
+            _stats["misses"] += 1
+        else:
+            _stats["shared"] += 1
+        stale = _cache.get(key)
+        if stale and time.time() - stale["timestamp"] > MAX_STALE_AGE:
+            stale = None
+
+    if not leader:
+        return waiter.result()
+
+    try:
+        value = asyncio.run(fetch(stale["value"] if stale else None))
+        with _lock:
+            _store(key, value)
+        waiter.set_result(value)
+        return value
+    except Exception as e:
+        if stale:
+            # Upstream is slow or down - serve what we already have
+            with _lock:
+                _stats["stale_served"] += 1
+            waiter.set_result(stale["value"])
+            return stale["value"]
+        waiter.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+# ============ UPSTREAM CALLS ============
+
+async def fetch_user_search(username):
+    """Search iNaturalist users by login prefix."""
+    url = f"{INAT_BASE}/users/autocomplete"
+    timeout = aiohttp.ClientTimeout(total=SEARCH_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(url, params={"q": username}, ssl=_ssl_context()) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+
+    users = []
+    for user in data.get('results', [])[:5]:
+        users.append({
+            'id': user.get('id'),
+            'login': user.get('login'),
+            'name': user.get('name', ''),
+            'icon': user.get('icon'),
+            'observations_count': user.get('observations_count', 0)
+        })
+    return users
+
+
+def _format_observation(obs):
+    taxon = obs.get('taxon') or {}
+    photos = obs.get('photos', [])
+    return {
+        'id': obs.get('id'),
+        'species': taxon.get('preferred_common_name') or taxon.get('name', 'Unknown'),
+        'scientific_name': taxon.get('name', ''),
+        'iconic_taxon': taxon.get('iconic_taxon_name', 'Other'),
+        'observed_on': obs.get('observed_on'),
+        'updated_at': obs.get('updated_at'),
+        'place_guess': obs.get('place_guess', ''),
+        'quality_grade': obs.get('quality_grade'),
+        'coordinates': obs.get('geojson', {}).get('coordinates', []),
+        'photo_url': photos[0].get('url', '').replace('square', 'medium') if photos else None,
+        'url': f"https://www.inaturalist.org/observations/{obs.get('id')}"
+    }
+
+
+async def fetch_user_observations(username, lat=None, lng=None, radius_km=1, updated_since=None,
+                                  quality_grade='research,needs_id'):
+    """
+    Fetch a user's observations, optionally near a location.
+    With updated_since, only observations created or edited after it are returned.
+    """
+    params = {
+        'user_login': username,
+        'per_page': 200,
+        'order': 'desc',
+        'order_by': 'observed_on',
+        'quality_grade': quality_grade,
+        'iconic_taxa': ICONIC_TAXA,
+    }
+    if lat is not None and lng is not None:
+        params['lat'] = lat
+        params['lng'] = lng
+        params['radius'] = radius_km
+    if updated_since:
+        params['updated_since'] = updated_since
+
+    url = f"{INAT_BASE}/observations"
+    timeout = aiohttp.ClientTimeout(total=OBSERVATIONS_TIMEOUT)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(url, params=params, ssl=_ssl_context()) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+
+    observations = [_format_observation(o) for o in data.get('results', []) if o.get('geojson')]
+    return observations, data.get('total_results', 0)
+
+
+def _merge_observations(existing, updates):
+    """
+    Merge updated observations into an existing list by id, newest first.
+    Updates downgraded to casual are removed. Returns (observations, added, removed).
+    """
+    by_id = {o['id']: o for o in existing}
+    added = removed = 0
+    for o in updates:
+        if o.get('quality_grade') == 'casual':
+            removed += by_id.pop(o['id'], None) is not None
+        else:
+            added += o['id'] not in by_id
+            by_id[o['id']] = o
+    observations = sorted(by_id.values(), key=lambda o: o.get('observed_on') or '', reverse=True)
+    return observations, added, removed
+
+
+# ============ CACHED ENTRY POINTS ============
+
+def search_users(username):
+    """Cached, single-flight user search."""
+    async def fetch(stale):
+        return await fetch_user_search(username)
+
+    return _single_flight(search_key(username), SEARCH_TTL, fetch)
+
+
+def sync_observations(username, lat=None, lng=None, radius_km=1):
+    """
+    Cached, single-flight observation sync.
+    The first call fetches everything; later refreshes only pull
+    observations updated since the previous sync.
+    """
+    async def fetch(stale):
+        synced_at = datetime.utcnow().isoformat() + "Z"
+        if stale and time.time() - stale.get('full_refresh_at', 0) < FULL_REFRESH_INTERVAL:
+            # Include casual so downgrades show up and can be dropped
+            updates, _ = await fetch_user_observations(
+                username, lat, lng, radius_km, updated_since=stale['synced_at'],
+                quality_grade='research,needs_id,casual')
+            observations, added, removed = _merge_observations(stale['observations'], updates)
+            return {
+                'observations': observations,
+                'total': max(stale['total'] + added - removed, len(observations)),
+                'synced_at': synced_at,
+                'full_refresh_at': stale['full_refresh_at'],
+                'fetched': len(updates),
+            }
+        observations, total = await fetch_user_observations(username, lat, lng, radius_km)
+        return {
+            'observations': observations,
+            'total': total,
+            'synced_at': synced_at,
+            'full_refresh_at': time.time(),
+            'fetched': len(observations),
+        }
+
+    key = observations_key(username, lat, lng, radius_km)
+    return _single_flight(key, OBSERVATIONS_TTL, fetch)
+
+
+def get_updated_observations(username, lat=None, lng=None, radius_km=1, updated_since=None):
+    """Uncached incremental fetch for clients that track their own sync cursor."""
+    synced_at = datetime.utcnow().isoformat() + "Z"
+    observations, total = asyncio.run(
+        fetch_user_observations(username, lat, lng, radius_km, updated_since=updated_since))
+    return {
+        'observations': observations,
+        'total': total,
+        'synced_at': synced_at,
+        'fetched': len(observations),
+    }
+
+
+def invalidate_user(username):
+    """Drop cached search and observation entries for a user."""
+    prefix = f"obs:{username.strip().lower()}"
+    with _lock:
+        for key in [k for k in _cache if k == prefix or k.startswith(prefix + ":")]:
+            del _cache[key]
+        _cache.pop(search_key(username), None)
+
+
+def get_cache_stats():
+    """Return cache statistics."""
+    return {**_stats, "entries": len(_cache), "inflight": len(_inflight)}
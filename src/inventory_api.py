@@ -11,8 +11,8 @@ import certifi
 from flask import request, jsonify
 from species_db import PLANTS
 from challenge_hooks import on_plant_added_sync
-from badge_engine import on_plant_added_check_badges
-from score_engine import recalculate_score_sync
+from badge_engine import on_plant_added_check_badges, invalidate_user_counters
+from score_engine import enqueue_recalculation
 from event_logger import log_plant_added
 
 SUPABASE_URL = "https://gqexnqmqwhpcrleksrkb.supabase.co"
@@ -180,11 +180,12 @@ def register_inventory_routes(app):
                 record['is_milkweed'] = 'milkweed' in known_plant.common_name.lower()
             
             result = await db_query('POST', 'plant_inventories', token, data=record)
-            return result, None
+            return (result, record, user_id), None
         
-        result, error = asyncio.run(insert())
+        inserted, error = asyncio.run(insert())
         if error:
             return jsonify({"error": error}), 401
+        result, record, user_id = inserted
         
         if isinstance(result, dict) and 'error' in result:
             return jsonify(result), result.get('status', 500)
@@ -201,6 +202,22 @@ def register_inventory_routes(app):
         except Exception as e:
             print(f"Challenge hook error: {e}")
         
+        log_plant_added(user_id, record['species'], record['count'], record['grid_hash'])
+        
+        # Badges are evaluated incrementally from this plant
+        new_badges = []
+        try:
+            new_badges = on_plant_added_check_badges(user_id, token, plant=record)
+        except Exception as e:
+            print(f"Badge hook error: {e}")
+        
+        # Score is recalculated in the background; bursts of adds coalesce
+        updated_score = None
+        try:
+            updated_score = enqueue_recalculation(user_id, record['grid_hash'], token, source='plant_added')
+        except Exception as e:
+            print(f"Score hook error: {e}")
+        
         return jsonify({
             "success": True,
             "plant": result[0] if result else None,
@@ -226,6 +243,8 @@ def register_inventory_routes(app):
             
             await db_query('DELETE', 'plant_inventories', token, 
                 filters={"id": plant_id, "user_id": user_id})
+            # Plant counters only move forward incrementally - reseed on the next event
+            invalidate_user_counters(user_id)
             return None
         
         error = asyncio.run(delete())
@@ -0,0 +1,250 @@
+"""
+Job Scheduler
+==============
+Cron-style schedules, leases and an in-process scheduler thread for the
+jobs in jobs_engine.
+
+Leases are flock()ed files, one per concurrency slot, so overlapping
+triggers (the scheduler, the admin endpoint, an external cron) never run
+more copies of a job than it allows - across threads and processes on
+the host. The OS drops the lock if a process dies, so a crashed run never
+leaves a job stuck. Every worker process runs its own scheduler, so each
+scheduled run also claims its minute in a file beside the leases: a short
+job that finishes inside the minute is not run again by the next worker.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+JOBS_STATE_DIR = os.environ.get(
+    "JOBS_STATE_DIR",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'jobs'),
+)
+
+
+# ============ CRON ============
+
+# (name, low, high) for: minute hour day-of-month month day-of-week (0 or 7 = Sunday)
+CRON_FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 7)]
+
+
+def _parse_field(spec, low, high):
+    values = set()
+    for part in spec.split(','):
+        part, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(x) for x in part.split('-', 1))
+        else:
+            # "5/10" means every 10 starting at 5
+            start = int(part)
+            end = high if step > 1 else start
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"bad cron field {spec!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Five-field cron expression ("*/15 * * * *", "0 6 1,15 8 *", ...), evaluated in UTC."""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        (self.minutes, self.hours, self.days, self.months, self.weekdays) = (
+            _parse_field(spec, low, high) for spec, (_, low, high) in zip(fields, CRON_FIELDS))
+        self.weekdays = frozenset(d % 7 for d in self.weekdays)
+        # As in cron: when both day fields are restricted, either may match
+        self.any_day = fields[2] != '*' and fields[4] != '*'
+
+    def _day_matches(self, dt):
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.any_day:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def matches(self, dt):
+        return (dt.minute in self.minutes and dt.hour in self.hours
+                and dt.month in self.months and self._day_matches(dt))
+
+    def next_after(self, dt):
+        """First matching minute after dt (None if nothing matches within a year)."""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366)
+        while dt < limit:
+            if dt.month not in self.months or not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        return None
+
+
+# ============ LEASES ============
+
+class JobLease:
+    """
+    Non-blocking lease on one of `slots` lock files for a job.
+    acquire() returns False when every slot is held.
+    """
+
+    def __init__(self, job_name, slots=1):
+        self.job_name = job_name
+        self.slots = max(1, slots)
+        self._fd = None
+        self.slot = None
+
+    def _path(self, slot):
+        return os.path.join(JOBS_STATE_DIR, f"{self.job_name}.{slot}.lock")
+
+    def acquire(self, trigger=None):
+        os.makedirs(JOBS_STATE_DIR, exist_ok=True)
+        for slot in range(self.slots):
+            fd = os.open(self._path(slot), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            # Holder details, for lease_status()
+            os.ftruncate(fd, 0)
+            os.write(fd, json.dumps({
+                "pid": os.getpid(),
+                "trigger": trigger,
+                "started_at": datetime.utcnow().isoformat(),
+            }).encode())
+            self._fd, self.slot = fd, slot
+            return True
+        return False
+
+    def claim_minute(self, minute):
+        """
+        Record the scheduled minute this run is for (an ISO string). False if
+        a run for that minute already started in any process on the host.
+        """
+        os.makedirs(JOBS_STATE_DIR, exist_ok=True)
+        fd = os.open(os.path.join(JOBS_STATE_DIR, f"{self.job_name}.minute"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.read(fd, 64).decode() == minute:
+                return False
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, minute.encode(), 0)
+            return True
+        finally:
+            # Closing drops the lock
+            os.close(fd)
+
+    def release(self):
+        if self._fd is None:
+            return
+        os.ftruncate(self._fd, 0)
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd, self.slot = None, None
+
+
+def lease_status(job_name, slots=1):
+    """Current holders of a job's lease slots."""
+    holders = []
+    for slot in range(max(1, slots)):
+        path = os.path.join(JOBS_STATE_DIR, f"{job_name}.{slot}.lock")
+        if not os.path.exists(path):
+            continue
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except BlockingIOError:
+            try:
+                holders.append({"slot": slot, **json.loads(os.read(fd, 4096) or b"{}")})
+            except ValueError:
+                holders.append({"slot": slot})
+        finally:
+            os.close(fd)
+    return holders
+
+
+# ============ SCHEDULER ============
+
+class JobScheduler:
+    """
+    Runs jobs on their cron schedules from a background thread. Every due
+    job is started as its own task, so independent jobs run in parallel;
+    overlap is prevented by the leases taken in run_job, and the scheduled
+    minute passed along lets run_job run each one once across processes.
+    """
+
+    def __init__(self, schedules, run_job):
+        # schedules: job name -> cron expression
+        self.schedules = {name: CronSchedule(expr) for name, expr in schedules.items()}
+        self.run_job = run_job
+        self.started_at = None
+        self.last_tick = None
+        self.runs = {}
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+
+    def due(self, minute):
+        return [name for name, schedule in self.schedules.items() if schedule.matches(minute)]
+
+    def next_run(self, name, now=None):
+        next_at = self.schedules[name].next_after(now or datetime.utcnow())
+        return next_at.isoformat() if next_at else None
+
+    async def _run(self, name, minute):
+        try:
+            result = await self.run_job(name, trigger="schedule", scheduled_for=minute.isoformat())
+        except Exception as e:
+            result = {"job": name, "status": "failed", "error": str(e)}
+        self.runs[name] = {"at": datetime.utcnow().isoformat(), "status": result.get("status")}
+
+    async def _loop(self):
+        tasks = set()
+        while not self._stop.is_set():
+            minute = datetime.utcnow().replace(second=0, microsecond=0)
+            if minute != self.last_tick:
+                self.last_tick = minute
+                for name in self.due(minute):
+                    task = asyncio.create_task(self._run(name, minute))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            # Wake shortly after the next minute starts
+            now = datetime.utcnow()
+            await asyncio.sleep(60.5 - now.second - now.microsecond / 1e6)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def start(self):
+        """Start the scheduler thread (again after a fork - each process gets its own)."""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self.started_at = time.time()
+        # Only fire on minutes that start after this, so restarts don't re-run jobs
+        self.last_tick = datetime.utcnow().replace(second=0, microsecond=0)
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._loop()),
+                                        name="job-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
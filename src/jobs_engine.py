@@ -7,10 +7,17 @@ Can be triggered via API or external cron (Render cron, GitHub Actions, etc.)
 
 import aiohttp
 import asyncio
+import json
+import multiprocessing
+import os
 import ssl
+import threading
+import time
 import certifi
 from flask import request, jsonify
 from admin_auth import require_admin
+from challenge_hooks import invalidate_challenge
+from job_scheduler import JOBS_STATE_DIR, JobLease, JobScheduler, lease_status
 from datetime import datetime, timedelta
 
 SUPABASE_URL = "https://gqexnqmqwhpcrleksrkb.supabase.co"
@@ -45,9 +52,9 @@ async def log_job(job_name, status, result=None, error=None):
         )
 
 
-async def create_alert(user_id, alert_type, title, message, priority='normal', expires_days=7):
-    """Create an alert for a user."""
-    record = {
+def alert_record(user_id, alert_type, title, message, priority='normal', expires_days=7):
+    """Build a user_alerts row."""
+    return {
         "user_id": user_id,
         "alert_type": alert_type,
         "title": title,
@@ -55,74 +62,140 @@ async def create_alert(user_id, alert_type, title, message, priority='normal', e
         "priority": priority,
         "expires_at": (datetime.utcnow() + timedelta(days=expires_days)).isoformat(),
     }
+
+
+async def create_alert(user_id, alert_type, title, message, priority='normal', expires_days=7):
+    """Create an alert for a user."""
+    await create_alerts([alert_record(user_id, alert_type, title, message, priority, expires_days)])
+
+
+ALERT_BATCH_SIZE = 1000
+
+
+async def create_alerts(records, session=None):
+    """Insert many alerts with one POST per ALERT_BATCH_SIZE rows. Returns rows inserted."""
+    if not records:
+        return 0
+    if session is None:
+        async with aiohttp.ClientSession() as session:
+            return await create_alerts(records, session)
     
-    async with aiohttp.ClientSession() as session:
-        await session.post(
-            f"{SUPABASE_URL}/rest/v1/user_alerts",
-            headers=_headers(),
-            ssl=_ssl_context(),
-            json=record
-        )
+    headers = _headers()
+    headers["Prefer"] = "return=minimal"
+    inserted = 0
+    for i in range(0, len(records), ALERT_BATCH_SIZE):
+        batch = records[i:i + ALERT_BATCH_SIZE]
+        async with session.post(f"{SUPABASE_URL}/rest/v1/user_alerts", headers=headers,
+                                ssl=_ssl_context(), json=batch) as resp:
+            if resp.status in (200, 201, 204):
+                inserted += len(batch)
+            else:
+                print(f"Alert insert error {resp.status}: {(await resp.text())[:200]}")
+    return inserted
 
 
 # ============ JOB: Expire Challenges ============
 
+# ids per in.() filter, keeps URLs well under PostgREST's limit
+ID_CHUNK = 100
+
+
+def _id_chunks(ids):
+    ids = list(ids)
+    for i in range(0, len(ids), ID_CHUNK):
+        yield ",".join(str(x) for x in ids[i:i + ID_CHUNK])
+
+
+async def _transition_challenges(session, ids, new_status):
+    """
+    Move active challenges to new_status with one filtered PATCH per chunk.
+    Only rows still active are touched, so a challenge is transitioned (and
+    notified) once even if jobs overlap. Returns the transitioned rows.
+    """
+    headers = _headers()
+    headers["Prefer"] = "return=representation"
+    transitioned = []
+    for chunk in _id_chunks(ids):
+        url = f"{SUPABASE_URL}/rest/v1/challenges?id=in.({chunk})&status=eq.active&select=id,name"
+        async with session.patch(url, headers=headers, ssl=_ssl_context(),
+                                 json={"status": new_status}) as resp:
+            if resp.status == 200:
+                transitioned.extend(await resp.json())
+    return transitioned
+
+
 async def job_expire_challenges():
-    """Mark challenges past end_date as expired."""
+    """Mark challenges past end_date as completed (goal met) or expired, in bulk."""
+    from supabase_reader import fetch_rows
+    
     now = datetime.utcnow().isoformat()
+    challenges = await fetch_rows(
+        "challenges", select="id,name,current_progress,goal_target",
+        filters=f"status=eq.active&ends_at=lt.{now}")
+    
+    # PostgREST can't filter on progress >= target, so split here and PATCH each group
+    completed_ids, expired_ids = [], []
+    for c in challenges:
+        goal = c.get('goal_target')
+        # A goal of 0 counts as met; only a missing goal defaults to 1
+        met = (c.get('current_progress') or 0) >= (1 if goal is None else goal)
+        (completed_ids if met else expired_ids).append(c['id'])
     
     async with aiohttp.ClientSession() as session:
-        # Find active challenges past end date
-        url = f"{SUPABASE_URL}/rest/v1/challenges?status=eq.active&ends_at=lt.{now}"
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            if resp.status != 200:
-                return {"expired": 0, "error": "Failed to fetch"}
-            challenges = await resp.json()
-        
-        expired_count = 0
-        for c in challenges:
-            # Check if goal was met
-            progress = c.get('current_progress', 0)
-            target = c.get('goal_target', 1)
-            
-            new_status = 'completed' if progress >= target else 'expired'
-            
-            # Update status
-            update_url = f"{SUPABASE_URL}/rest/v1/challenges?id=eq.{c['id']}"
-            headers = _headers()
-            headers["Prefer"] = "return=representation"
-            
-            async with session.patch(
-                update_url,
-                headers=headers,
-                ssl=_ssl_context(),
-                json={"status": new_status}
-            ) as resp:
-                if resp.status == 200:
-                    expired_count += 1
-                    
-                    # Notify participants if completed
-                    if new_status == 'completed':
-                        await notify_challenge_complete(c['id'], c.get('name', 'Challenge'))
-    
-    return {"expired": expired_count, "checked": len(challenges)}
+        completed, expired = await asyncio.gather(
+            _transition_challenges(session, completed_ids, 'completed'),
+            _transition_challenges(session, expired_ids, 'expired'),
+        )
+        alerts_sent = await notify_challenges_complete(completed, session)
+    
+    for c in completed + expired:
+        invalidate_challenge(c['id'])
+    
+    return {
+        "expired": len(completed) + len(expired),
+        "completed": len(completed),
+        "checked": len(challenges),
+        "alerts_sent": alerts_sent,
+    }
+
+
+async def notify_challenges_complete(challenges, session=None):
+    """
+    Alert every participant of the given completed challenges ({"id", "name"}):
+    one paged participant read and one batched alert insert. Each
+    participant's challenge_completed badge event is applied too.
+    """
+    from supabase_reader import fetch_rows
+    
+    if not challenges:
+        return 0
+    names = {c['id']: c.get('name') or 'Challenge' for c in challenges}
+    participants = []
+    for chunk in _id_chunks(names):
+        participants.extend(await fetch_rows(
+            "challenge_participants", select="challenge_id,user_id",
+            filters=f"challenge_id=in.({chunk})", order="challenge_id,user_id"))
+    
+    records = [
+        alert_record(
+            user_id=p['user_id'],
+            alert_type='challenge_complete',
+            title=f"🎉 {names.get(p['challenge_id'], 'Challenge')} Complete!",
+            message="Your neighborhood achieved the goal! Check your badges.",
+            priority='high',
+        )
+        for p in participants if p.get('user_id')
+    ]
+    sent = await create_alerts(records, session)
+    
+    from badge_engine import apply_badge_event
+    await apply_badge_event([p.get('user_id') for p in participants], "challenge_completed")
+    return sent
 
 
 async def notify_challenge_complete(challenge_id, challenge_name):
     """Notify all participants that challenge completed."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SUPABASE_URL}/rest/v1/challenge_participants?challenge_id=eq.{challenge_id}"
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            if resp.status == 200:
-                participants = await resp.json()
-                for p in participants:
-                    await create_alert(
-                        user_id=p['user_id'],
-                        alert_type='challenge_complete',
-                        title=f"🎉 {challenge_name} Complete!",
-                        message="Your neighborhood achieved the goal! Check your badges.",
-                        priority='high',
-                    )
+    return await notify_challenges_complete([{"id": challenge_id, "name": challenge_name}])
 
 
 # ============ JOB: Seasonal Alerts ============
@@ -160,67 +233,158 @@ SEASONAL_ALERTS = {
 }
 
 
+# Users (assessment rows) per page; each page is one read, one
+# existing-alert lookup per ID_CHUNK users and one bulk insert
+SEASONAL_PAGE_SIZE = 500
+# Don't resend an alert type sent within this many days
+SEASONAL_DEDUPE_DAYS = 30
+
+
+def _checkpoint_path(job_name):
+    return os.path.join(JOBS_STATE_DIR, f"{job_name}.checkpoint.json")
+
+
+def _read_checkpoint(job_name):
+    try:
+        with open(_checkpoint_path(job_name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(job_name, state):
+    os.makedirs(JOBS_STATE_DIR, exist_ok=True)
+    path = _checkpoint_path(job_name)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _due_seasonal_alerts(now):
+    return [key for key, config in SEASONAL_ALERTS.items()
+            if now.month in config.get('months', []) and now.day in config.get('days', [1])]
+
+
+async def _recent_alert_keys(user_ids, alert_keys, since):
+    """(user_id, alert_type) pairs already sent since `since`, one query per ID_CHUNK users."""
+    from supabase_reader import fetch_rows
+    
+    types = ",".join(alert_keys)
+    chunks = await asyncio.gather(*(
+        fetch_rows("user_alerts", select="id,user_id,alert_type",
+                   filters=f"alert_type=in.({types})&user_id=in.({chunk})&created_at=gte.{since}")
+        for chunk in _id_chunks(user_ids)
+    ))
+    return {(row['user_id'], row['alert_type']) for rows in chunks for row in rows}
+
+
+def _seasonal_candidates(rows, alert_keys, decided=None):
+    """
+    (user_id, alert_key) pairs for one page of assessments. Rows arrive in
+    user_id order, so the first row per user decides; `decided` is the user
+    carried over from the previous page, already handled there.
+    """
+    users = {}
+    for a in rows:
+        if a.get('user_id') and a['user_id'] != decided and a['user_id'] not in users:
+            users[a['user_id']] = {
+                'has_fall_blooms': a.get('has_fall_blooms', False),
+                'has_milkweed': a.get('milkweed_present') not in [None, 'none'],
+            }
+    return users, [
+        (user_id, key)
+        for user_id, user_data in users.items()
+        for key in alert_keys
+        if not SEASONAL_ALERTS[key].get('check_condition')
+        or SEASONAL_ALERTS[key]['check_condition'](user_data)
+    ]
+
+
+# Assessments are read in user order so each user's rows are contiguous
+SEASONAL_KEY = "user_id,id"
+
+
 async def job_seasonal_alerts():
-    """Send seasonal alerts to users who need them."""
+    """
+    Send today's seasonal alerts to users who need them.
+    
+    Streams assessments a page at a time in user order: for each page the
+    alerts already sent are looked up in bulk, diffed locally and the new
+    ones inserted. The checkpoint only moves past a page once all of its
+    alerts are in, so a run that fails on a read or an insert stops there
+    and the next run resumes from that page (the diff keeps a replayed page
+    from sending duplicates).
+    """
+    from supabase_reader import iter_pages_keyset, keyset_cursor
+    
     now = datetime.utcnow()
-    current_month = now.month
-    current_day = now.day
+    alert_keys = _due_seasonal_alerts(now)
+    if not alert_keys:
+        return {"alerts_sent": 0, "users_checked": 0, "alert_types": []}
     
-    alerts_sent = 0
+    state = _read_checkpoint("seasonal_alerts")
+    resumed = bool(state and state.get("status") == "running"
+                   and state.get("run_date") == now.date().isoformat()
+                   and state.get("alert_keys") == alert_keys
+                   and state.get("key") == SEASONAL_KEY)
+    if not resumed:
+        state = {
+            "run_date": now.date().isoformat(),
+            "alert_keys": alert_keys,
+            "key": SEASONAL_KEY,
+            "status": "running",
+            "cursor": None,
+            "last_user": None,
+            "pages": 0,
+            "users_checked": 0,
+            "alerts_sent": 0,
+        }
+        _write_checkpoint("seasonal_alerts", state)
     
-    for alert_key, alert_config in SEASONAL_ALERTS.items():
-        # Check if this alert should run today
-        if current_month not in alert_config.get('months', []):
-            continue
-        if current_day not in alert_config.get('days', [1]):
-            continue
-        
-        # Get users to alert
-        async with aiohttp.ClientSession() as session:
-            # Get users with assessments
-            url = f"{SUPABASE_URL}/rest/v1/habitat_assessments?select=user_id,has_fall_blooms,milkweed_present"
-            async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-                if resp.status != 200:
-                    continue
-                assessments = await resp.json()
+    since = (now - timedelta(days=SEASONAL_DEDUPE_DAYS)).isoformat()
+    async with aiohttp.ClientSession() as session:
+        # A read error raises out of here, leaving the checkpoint at the last good page
+        async for rows in iter_pages_keyset(
+                "habitat_assessments", select="id,user_id,has_fall_blooms,milkweed_present",
+                filters="user_id=not.is.null", key=SEASONAL_KEY,
+                page_size=SEASONAL_PAGE_SIZE, after=state["cursor"]):
+            users, candidates = _seasonal_candidates(rows, alert_keys, state["last_user"])
+            if candidates:
+                sent = await _recent_alert_keys(users, alert_keys, since)
+                records = [
+                    alert_record(
+                        user_id=user_id,
+                        alert_type=key,
+                        title=SEASONAL_ALERTS[key]['title'],
+                        message=SEASONAL_ALERTS[key].get('message', ''),
+                        priority=SEASONAL_ALERTS[key].get('priority', 'normal'),
+                    )
+                    for user_id, key in candidates if (user_id, key) not in sent
+                ]
+                inserted = await create_alerts(records, session)
+                state["alerts_sent"] += inserted
+                if inserted < len(records):
+                    _write_checkpoint("seasonal_alerts", state)
+                    raise RuntimeError(
+                        f"only {inserted} of {len(records)} seasonal alerts inserted; "
+                        f"the next run resumes from page {state['pages'] + 1}")
             
-            # Dedupe users
-            users_seen = set()
-            for a in assessments:
-                user_id = a.get('user_id')
-                if user_id in users_seen:
-                    continue
-                users_seen.add(user_id)
-                
-                # Check condition if exists
-                check = alert_config.get('check_condition')
-                if check:
-                    user_data = {
-                        'has_fall_blooms': a.get('has_fall_blooms', False),
-                        'has_milkweed': a.get('milkweed_present') not in [None, 'none'],
-                    }
-                    if not check(user_data):
-                        continue
-                
-                # Check if already sent this alert recently
-                check_url = f"{SUPABASE_URL}/rest/v1/user_alerts?user_id=eq.{user_id}&alert_type=eq.{alert_key}&created_at=gte.{(now - timedelta(days=30)).isoformat()}"
-                async with session.get(check_url, headers=_headers(), ssl=_ssl_context()) as resp:
-                    if resp.status == 200:
-                        existing = await resp.json()
-                        if existing:
-                            continue
-                
-                # Send alert
-                await create_alert(
-                    user_id=user_id,
-                    alert_type=alert_key,
-                    title=alert_config['title'],
-                    message=alert_config.get('message', ''),
-                    priority=alert_config.get('priority', 'normal'),
-                )
-                alerts_sent += 1
+            state["cursor"] = keyset_cursor(rows[-1], SEASONAL_KEY)
+            state["last_user"] = rows[-1]['user_id']
+            state["pages"] += 1
+            state["users_checked"] += len(users)
+            _write_checkpoint("seasonal_alerts", state)
     
-    return {"alerts_sent": alerts_sent}
+    state["status"] = "complete"
+    _write_checkpoint("seasonal_alerts", state)
+    return {
+        "alerts_sent": state["alerts_sent"],
+        "users_checked": state["users_checked"],
+        "pages": state["pages"],
+        "alert_types": alert_keys,
+        "resumed": resumed,
+    }
 
 
 # ============ JOB: Cleanup Expired Alerts ============
@@ -247,32 +411,33 @@ async def job_cleanup_alerts():
 # ============ JOB: Recalculate Stale Scores ============
 
 async def job_recalc_stale_scores():
-    """Recalculate scores not updated in 7+ days."""
-    from score_engine import recalculate_and_store_score
+    """Recalculate scores not updated in 7+ days (bulk rescoring pipeline)."""
+    from score_engine import rescore_users
     
     stale_date = (datetime.utcnow() - timedelta(days=7)).isoformat()
+    result = await rescore_users(stale_before=stale_date, source='scheduled')
+    return {"recalculated": result["written"], "checked": result["keys"],
+            "write_failed": result.get("write_failed", 0), "write_errors": result.get("write_errors", []),
+            "users_per_second": result["users_per_second"]}
+
+
+async def job_rescore_all(stale_days=None, source='bulk'):
+    """Rescore every stored score (run after a scoring config change), or those older than stale_days."""
+    from score_engine import rescore_users
     
-    async with aiohttp.ClientSession() as session:
-        url = f"{SUPABASE_URL}/rest/v1/user_scores?calculated_at=lt.{stale_date}&limit=50"
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            if resp.status != 200:
-                return {"recalculated": 0}
-            stale = await resp.json()
-        
-        recalc_count = 0
-        for s in stale:
-            try:
-                await recalculate_and_store_score(
-                    s['user_id'],
-                    s.get('grid_hash'),
-                    SUPABASE_KEY,
-                    source='scheduled'
-                )
-                recalc_count += 1
-            except Exception as e:
-                print(f"Recalc error: {e}")
-    
-    return {"recalculated": recalc_count, "checked": len(stale)}
+    stale_before = None
+    if stale_days is not None:
+        stale_before = (datetime.utcnow() - timedelta(days=stale_days)).isoformat()
+    return await rescore_users(stale_before=stale_before, source=source)
+
+
+# ============ JOB: Reconcile Badges ============
+
+async def job_reconcile_badges():
+    """Full badge check for recently active users (backs up incremental evaluation)."""
+    from badge_engine import reconcile_badges
+    
+    return await reconcile_badges(days=1)
 
 
 # ============ Job Runner ============
@@ -282,47 +447,155 @@ JOBS = {
     "seasonal_alerts": job_seasonal_alerts,
     "cleanup_alerts": job_cleanup_alerts,
     "recalc_stale_scores": job_recalc_stale_scores,
+    "rescore_all": job_rescore_all,
+    "reconcile_badges": job_reconcile_badges,
+}
+
+# schedule: cron expression in UTC (None = run on demand only)
+# max_concurrent: copies allowed to run at once (lease slots)
+# rows: result key counting rows processed, for throughput metrics
+JOB_SPECS = {
+    "expire_challenges": {"schedule": "5 * * * *", "max_concurrent": 1, "rows": "checked"},
+    "seasonal_alerts": {"schedule": "0 15 * * *", "max_concurrent": 1, "rows": "users_checked"},
+    "cleanup_alerts": {"schedule": "30 3 * * *", "max_concurrent": 1, "rows": None},
+    "recalc_stale_scores": {"schedule": "0 4 * * *", "max_concurrent": 1, "rows": "checked"},
+    "rescore_all": {"schedule": None, "max_concurrent": 1, "rows": "keys"},
+    "reconcile_badges": {"schedule": "0 5 * * *", "max_concurrent": 1, "rows": "users_checked"},
 }
 
+# Set JOB_SCHEDULER=1 to run the schedules in-process (otherwise use external cron)
+SCHEDULER_ENABLED = os.environ.get("JOB_SCHEDULER", "").lower() in ("1", "true", "yes")
+
+# job name -> last run metrics (this process)
+_job_metrics = {}
+
+
+def _metrics(job_name, result, started, finished):
+    seconds = finished - started
+    rows_key = JOB_SPECS.get(job_name, {}).get("rows")
+    rows = result.get(rows_key) if rows_key and isinstance(result, dict) else None
+    return {
+        "duration_ms": round(seconds * 1000, 1),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds, 1) if rows and seconds > 0 else None,
+    }
+
 
-async def run_job(job_name):
-    """Run a specific job and log results."""
+async def run_job(job_name, trigger="manual", scheduled_for=None, **params):
+    """
+    Run a specific job and log results. A job already running (here or in
+    another process on the host) is skipped rather than run twice, as is a
+    scheduled run whose minute (scheduled_for) another process already ran.
+    params are passed to the job function.
+    """
     if job_name not in JOBS:
         return {"error": f"Unknown job: {job_name}"}
     
-    await log_job(job_name, "running")
+    lease = JobLease(job_name, JOB_SPECS.get(job_name, {}).get("max_concurrent", 1))
+    if not lease.acquire(trigger):
+        return {"job": job_name, "status": "skipped", "reason": "already running"}
+    if scheduled_for and not lease.claim_minute(scheduled_for):
+        lease.release()
+        return {"job": job_name, "status": "skipped", "reason": f"already ran for {scheduled_for}"}
+    return await _run_leased(job_name, lease, trigger, params)
+
+
+def start_job(job_name, trigger="manual", **params):
+    """
+    Start a job on a background thread and return at once, for work too
+    long for a request. Returns "started", or "skipped" if it is already
+    running; the outcome goes to job_history and the schedule status.
+    """
+    if job_name not in JOBS:
+        return {"error": f"Unknown job: {job_name}"}
+    
+    lease = JobLease(job_name, JOB_SPECS.get(job_name, {}).get("max_concurrent", 1))
+    if not lease.acquire(trigger):
+        return {"job": job_name, "status": "skipped", "reason": "already running"}
     
+    def run():
+        try:
+            asyncio.run(_run_leased(job_name, lease, trigger, params))
+        except Exception as e:
+            print(f"Job {job_name} error: {e}")
+    
+    threading.Thread(target=run, name=f"job-{job_name}", daemon=True).start()
+    return {"job": job_name, "status": "started", "trigger": trigger,
+            "started_at": datetime.utcnow().isoformat()}
+
+
+async def _run_leased(job_name, lease, trigger, params):
+    """Run a job whose lease is already held, then release it."""
     try:
-        result = await JOBS[job_name]()
-        await log_job(job_name, "completed", result=result)
-        return {"job": job_name, "status": "completed", "result": result}
-    except Exception as e:
-        await log_job(job_name, "failed", error=str(e))
-        return {"job": job_name, "status": "failed", "error": str(e)}
+        await log_job(job_name, "running")
+        started = time.perf_counter()
+        try:
+            result = await JOBS[job_name](**params)
+        except Exception as e:
+            metrics = _metrics(job_name, None, started, time.perf_counter())
+            _job_metrics[job_name] = {**metrics, "status": "failed", "trigger": trigger}
+            await log_job(job_name, "failed", result={"metrics": metrics, "trigger": trigger}, error=str(e))
+            return {"job": job_name, "status": "failed", "error": str(e), "metrics": metrics}
+        
+        metrics = _metrics(job_name, result, started, time.perf_counter())
+        _job_metrics[job_name] = {**metrics, "status": "completed", "trigger": trigger}
+        logged = {**result, "metrics": metrics, "trigger": trigger} if isinstance(result, dict) else result
+        await log_job(job_name, "completed", result=logged)
+        return {"job": job_name, "status": "completed", "result": result, "metrics": metrics}
+    finally:
+        lease.release()
 
 
 async def run_all_jobs():
-    """Run all scheduled jobs."""
-    results = {}
-    for job_name in JOBS:
-        results[job_name] = await run_job(job_name)
-    return results
+    """Run all scheduled jobs (independent jobs run in parallel)."""
+    names = [name for name in JOBS if JOB_SPECS.get(name, {}).get("schedule")]
+    results = await asyncio.gather(*(run_job(name) for name in names))
+    return dict(zip(names, results))
+
+
+scheduler = JobScheduler(
+    {name: spec["schedule"] for name, spec in JOB_SPECS.items() if spec.get("schedule")},
+    run_job,
+)
+
+
+def get_schedule_status():
+    """Schedules, next runs, current lease holders and last-run metrics."""
+    return {
+        "scheduler_running": scheduler.running,
+        "jobs": {
+            name: {
+                "schedule": spec.get("schedule"),
+                "next_run": scheduler.next_run(name) if name in scheduler.schedules else None,
+                "max_concurrent": spec.get("max_concurrent", 1),
+                "running": lease_status(name, spec.get("max_concurrent", 1)),
+                "last_run": _job_metrics.get(name),
+            }
+            for name, spec in JOB_SPECS.items()
+        },
+    }
 
 
 def register_jobs_routes(app):
     """Register jobs API routes."""
     
+    # Not in multiprocessing children (the rescoring pool spawns processes that re-import the app)
+    if SCHEDULER_ENABLED and multiprocessing.parent_process() is None:
+        scheduler.start()
+    
     @app.route('/api/jobs/run/<job_name>', methods=['POST'])
     @require_admin
     def run_single_job(job_name):
-        """Run a specific job. TODO: Add admin auth."""
+        """Run a specific job now (admin only); 409 if it is already running."""
         result = asyncio.run(run_job(job_name))
+        if result.get('status') == 'skipped':
+            return jsonify(result), 409
         return jsonify(result)
     
     @app.route('/api/jobs/run-all', methods=['POST'])
     @require_admin
     def run_all():
-        """Run all scheduled jobs. TODO: Add admin auth."""
+        """Run all scheduled jobs now (admin only)."""
         results = asyncio.run(run_all_jobs())
         return jsonify({
             "ran_at": datetime.utcnow().isoformat(),
@@ -337,6 +610,12 @@ def register_jobs_routes(app):
             "seasonal_alerts": list(SEASONAL_ALERTS.keys()),
         })
     
+    @app.route('/api/jobs/schedule', methods=['GET'])
+    @require_admin
+    def job_schedule():
+        """Job schedules, next runs and what is running now (admin only - shows lease holders)."""
+        return jsonify(get_schedule_status())
+    
     @app.route('/api/jobs/history', methods=['GET'])
     def job_history():
         """Get recent job history."""
@@ -6,6 +6,8 @@ from flask import request, jsonify
 import asyncio
 from database import add_entry, get_leaderboard, get_user_rankings
 from leaderboard import GeocodingService, get_wards_for_area
+from map_grid_cache import invalidate_grid_cache
+from boundaries import polygon_area
 
 
 def _get_identity_level(score: float) -> str:
@@ -50,6 +52,9 @@ def register_leaderboard_routes(app):
         # Geocode location
         location = _run_async(geocoder.reverse_geocode(lat, lng))
         
+        # Local boundary polygons win over reverse-geocoded names
+        area = polygon_area(location.grid_hash)
+        
         # Calculate identity level
         identity = _get_identity_level(data['score'])
         
@@ -61,17 +66,19 @@ def register_leaderboard_routes(app):
             score=data['score'],
             grade=data['grade'],
             display_name=data.get('display_name', 'Anonymous Gardener'),
-            city=location.city,
+            city=area["city"] or location.city,
             county=location.county,
             state=location.state or "Utah",
-            zip_code=location.zip_code,
-            ward=data.get('ward'),
+            zip_code=area["zip"] or location.zip_code,
+            ward=data.get('ward') or area["ward"],
             identity_level=identity,
         ))
         
         if "error" in entry:
             return jsonify(entry), 500
         
+        invalidate_grid_cache()
+        
         # Get rankings
         rankings = _run_async(get_user_rankings(location.grid_hash))
         
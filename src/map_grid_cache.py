@@ -0,0 +1,199 @@
+"""
+Map Grid Cache
+===============
+Grid-keyed join cache for the map property layer.
+Leaderboard entries and observations are filtered server-side,
+aggregated once per grid_hash and reused until the TTL expires.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from database import get_leaderboard
+from observations import get_observations
+
+LEADERBOARD_LIMIT = 500
+OBSERVATION_LIMIT = 1000
+
+# Bounded LRU: key -> (rows, timestamp)
+_cache = OrderedDict()
+_cache_ttl = 300  # 5 minutes
+MAX_ENTRIES = 500
+_lock = threading.Lock()
+_generation = 0  # bumped by invalidate_grid_cache; older reads aren't stored
+
+# Bounding boxes are widened to this grid (degrees) so nearby pans share a key
+BBOX_STEP = 0.01
+
+
+def parse_bounds(value: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Parse a "minLng,minLat,maxLng,maxLat" query param.
+    Returns None if missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        min_lng, min_lat, max_lng, max_lat = [float(v) for v in value.split(',')]
+    except ValueError:
+        return None
+    if min_lng > max_lng or min_lat > max_lat:
+        return None
+    return (min_lng, min_lat, max_lng, max_lat)
+
+
+def quantize_bounds(bbox):
+    """Widen a bbox outward to BBOX_STEP, so it still covers what was asked for."""
+    if not bbox:
+        return bbox
+    min_lng, min_lat, max_lng, max_lat = bbox
+    return (
+        round(math.floor(min_lng / BBOX_STEP) * BBOX_STEP, 6),
+        round(math.floor(min_lat / BBOX_STEP) * BBOX_STEP, 6),
+        round(math.ceil(max_lng / BBOX_STEP) * BBOX_STEP, 6),
+        round(math.ceil(max_lat / BBOX_STEP) * BBOX_STEP, 6),
+    )
+
+
+def _cache_key(city, status, bbox):
+    return f"{city or '*'}|{status or '*'}|{bbox or '*'}"
+
+
+def _coords_from_grid(grid_hash):
+    """Parse "40.666_-111.897" into (lat, lng)."""
+    try:
+        lat, lng = grid_hash.split('_')
+        return float(lat), float(lng)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+def aggregate_grid_rows(lb_entries: List[Dict], observations: List[Dict]) -> List[Dict]:
+    """Join leaderboard entries and observations into one row per grid_hash."""
+    grids = {}
+
+    def row_for(grid_hash):
+        if grid_hash not in grids:
+            grids[grid_hash] = {
+                "grid_hash": grid_hash,
+                "leaderboard": None,
+                "observation_count": 0,
+                "species": set(),
+                "september_count": 0,
+            }
+        return grids[grid_hash]
+
+    for entry in lb_entries:
+        gh = entry.get('grid_hash')
+        if gh:
+            row = row_for(gh)
+            # Entries arrive sorted by score desc; keep the top one per grid
+            if row["leaderboard"] is None:
+                row["leaderboard"] = entry
+
+    for obs in observations:
+        gh = obs.get('grid_hash')
+        if not gh:
+            continue
+        row = row_for(gh)
+        row["observation_count"] += 1
+        if obs.get('species_guess'):
+            row["species"].add(obs['species_guess'])
+        observed_at = obs.get('observed_at') or ''
+        if '-09-' in observed_at:
+            row["september_count"] += 1
+
+    rows = []
+    for gh, row in grids.items():
+        lb = row["leaderboard"] or {}
+        lat, lng = lb.get('lat'), lb.get('lng')
+        if not lat or not lng:
+            lat, lng = _coords_from_grid(gh)
+            if lat is None:
+                continue
+        rows.append({
+            "grid_hash": gh,
+            "lat": lat,
+            "lng": lng,
+            "leaderboard": row["leaderboard"],
+            "observation_count": row["observation_count"],
+            "species_count": len(row["species"]),
+            "september_count": row["september_count"],
+        })
+    return rows
+
+
+async def get_grid_rows(city=None, status=None, bbox=None) -> List[Dict]:
+    """
+    Get pre-aggregated per-grid rows for the property layer.
+
+    Both source queries run concurrently with filters and column
+    projection pushed down to PostgREST. The bbox is widened to BBOX_STEP,
+    so rows just outside the requested box may be included.
+    """
+    bbox = quantize_bounds(bbox)
+    key = _cache_key(city, status, bbox)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            rows, timestamp = cached
+            if time.time() - timestamp < _cache_ttl:
+                _cache.move_to_end(key)
+                return rows
+            del _cache[key]
+        generation = _generation
+
+    level = 'city' if city else 'state'
+    lb_result, obs_result = await asyncio.gather(
+        get_leaderboard(
+            level=level,
+            filter_value=city,
+            limit=LEADERBOARD_LIMIT,
+            bbox=bbox,
+            select="grid_hash,lat,lng,display_name,score,grade,identity_level,city,ward",
+        ),
+        get_observations(
+            status=status,
+            city=city,
+            bbox=bbox,
+            limit=OBSERVATION_LIMIT,
+            select="grid_hash,species_guess,observed_at",
+        ),
+    )
+
+    rows = aggregate_grid_rows(lb_result.get('entries', []), obs_result.get('observations', []))
+    with _lock:
+        # Skip the write if the cache was invalidated while we were reading
+        if _generation == generation:
+            _cache[key] = (rows, time.time())
+            _cache.move_to_end(key)
+            now = time.time()
+            for old_key in [k for k, (_, ts) in _cache.items() if now - ts >= _cache_ttl]:
+                del _cache[old_key]
+            while len(_cache) > MAX_ENTRIES:
+                _cache.popitem(last=False)
+    return rows
+
+
+def invalidate_grid_cache():
+    """Drop all cached grid rows (call after writes that move the map)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+
+
+def get_cache_stats():
+    """Return cache statistics."""
+    with _lock:
+        entries = len(_cache)
+    return {
+        "entries": entries,
+        "max_entries": MAX_ENTRIES,
+        "ttl_seconds": _cache_ttl,
+        "bbox_step": BBOX_STEP,
+    }
@@ -10,7 +10,7 @@ import certifi
 import base64
 import uuid
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 # Supabase credentials
 SUPABASE_URL = "https://gqexnqmqwhpcrleksrkb.supabase.co"
@@ -184,15 +184,28 @@ async def get_observations(
     status: Optional[str] = None,
     grid_hash: Optional[str] = None,
     limit: int = 50,
+    city: Optional[str] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    select: str = "*",
 ) -> Dict:
-    """Get observations with optional filters."""
+    """
+    Get observations with optional filters.
+    
+    All filters are applied by PostgREST so `limit` counts matching rows.
+    bbox is (min_lng, min_lat, max_lng, max_lat).
+    """
     
-    url = f"{SUPABASE_URL}/rest/v1/{TABLE}?select=*&order=created_at.desc&limit={limit}"
+    url = f"{SUPABASE_URL}/rest/v1/{TABLE}?select={select}&order=created_at.desc&limit={limit}"
     
     if status:
         url += f"&status=eq.{status}"
     if grid_hash:
         url += f"&grid_hash=eq.{grid_hash}"
+    if city:
+        url += f"&city=eq.{city}"
+    if bbox:
+        min_lng, min_lat, max_lng, max_lat = bbox
+        url += f"&lat=gte.{min_lat}&lat=lte.{max_lat}&lng=gte.{min_lng}&lng=lte.{max_lng}"
     
     connector = aiohttp.TCPConnector(ssl=_ssl_context())
     async with aiohttp.ClientSession(connector=connector) as session:
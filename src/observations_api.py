@@ -8,6 +8,7 @@ from observations import submit_observation, get_observations, get_my_observatio
 from auth import get_user
 from challenge_hooks import on_observation_added_sync
 from badge_engine import on_observation_added_check_badges
+from map_grid_cache import invalidate_grid_cache
 
 
 def _run_async(coro):
@@ -95,6 +96,8 @@ def register_observation_routes(app):
         ))
         
         if result.get('success'):
+            invalidate_grid_cache()
+            
             # Auto-contribute to challenges & check badges
             challenge_contributions = []
             new_badges = []
@@ -0,0 +1,197 @@
+"""
+What-If Improvement Optimizer
+==============================
+Enumerates combinations of candidate improvement actions for a property,
+scores every combination at once with the batch scorer and returns the
+Pareto-optimal plans (highest score for each cost).
+
+Scenario columns are built by doubling: each action is applied once to all
+combinations built so far (shared prefixes), so 2^n scenarios cost n
+vectorized updates rather than n * 2^n single-property edits.
+"""
+
+import time
+
+import numpy as np
+
+from scoring_batch import columns_from_properties, score_properties
+from scoring_v2 import PropertyData
+
+# 2^12 = 4096 scenarios; keeps a request well under 100 ms
+MAX_ACTIONS = 12
+
+
+# ============ ACTIONS ============
+
+def _add_plants(species, native=True, milkweed=0, seasons=(), coverage=0):
+    def apply(c):
+        c["plant_species"] = c["plant_species"] + species
+        if native:
+            c["native_species"] = c["native_species"] + species
+        c["milkweed_count"] = c["milkweed_count"] + milkweed
+        for season in seasons:
+            c[f"blooms_{season}"] = np.ones_like(c[f"blooms_{season}"])
+        c["estimated_flower_coverage_pct"] = np.minimum(c["estimated_flower_coverage_pct"] + coverage, 100)
+    return apply
+
+
+def _set(column, value):
+    def apply(c):
+        # np.full, not full_like: a string column may be narrower than value
+        c[column] = np.full(c[column].shape, value)
+    return apply
+
+
+def _bare_ground(c):
+    c["has_bare_ground"] = np.ones_like(c["has_bare_ground"])
+    c["bare_ground_sqft"] = np.maximum(c["bare_ground_sqft"], 50)
+
+
+def _stop_pesticides(c):
+    c["uses_pesticides"] = np.zeros_like(c["uses_pesticides"])
+    c["pesticide_frequency"] = np.full(c["pesticide_frequency"].shape, "never")
+
+
+def _reduce_mowing(c):
+    # Properties that never mow already leave the area alone
+    c["mowing_frequency"] = np.where(c["mowing_frequency"] == "never", "never", "rarely")
+
+
+def _invite_neighbor(c):
+    c["neighbors_in_program"] = c["neighbors_in_program"] + 1
+
+
+def _reduce_impervious(c):
+    c["impervious_surface_pct"] = np.maximum(c["impervious_surface_pct"] - 10, 0)
+
+
+# cost: rough out-of-pocket USD; hours: rough effort
+ACTIONS = [
+    {"id": "add_fall_bloomers", "title": "Plant 2 native fall bloomers (rabbitbrush, goldenrod, asters)",
+     "cost": 40, "hours": 2, "apply": _add_plants(2, seasons=("fall",), coverage=5)},
+    {"id": "add_milkweed", "title": "Plant 5 showy or narrowleaf milkweed",
+     "cost": 35, "hours": 2, "apply": _add_plants(1, milkweed=5, seasons=("summer",), coverage=3)},
+    {"id": "add_spring_bloomers", "title": "Plant 2 native spring bloomers (penstemon, globemallow)",
+     "cost": 30, "hours": 1.5, "apply": _add_plants(2, seasons=("spring",), coverage=3)},
+    {"id": "add_native_bed", "title": "Convert lawn to a native flower bed (~100 sqft)",
+     "cost": 150, "hours": 8, "apply": _add_plants(4, seasons=("spring", "summer"), coverage=10)},
+    {"id": "leave_bare_ground", "title": "Leave a 50 sqft patch of bare, undisturbed soil",
+     "cost": 0, "hours": 1, "apply": _bare_ground},
+    {"id": "leave_stems", "title": "Leave stems and leaves standing over winter",
+     "cost": 0, "hours": 0, "apply": _set("leaves_stems_over_winter", True)},
+    {"id": "reduce_mowing", "title": "Mow rarely (or let an area grow)",
+     "cost": 0, "hours": 0, "apply": _reduce_mowing},
+    {"id": "add_dead_wood", "title": "Add a dead log or stump",
+     "cost": 0, "hours": 1, "apply": _set("has_dead_wood", True)},
+    {"id": "add_brush_pile", "title": "Build a brush pile from prunings",
+     "cost": 0, "hours": 1, "apply": _set("has_brush_pile", True)},
+    {"id": "add_bee_hotel", "title": "Install a bee hotel",
+     "cost": 35, "hours": 0.5, "apply": _set("has_bee_hotel", True)},
+    {"id": "stop_pesticides", "title": "Stop using pesticides",
+     "cost": 0, "hours": 0, "apply": _stop_pesticides},
+    {"id": "invite_neighbor", "title": "Invite a neighbor to join the program",
+     "cost": 0, "hours": 0.5, "apply": _invite_neighbor},
+    {"id": "reduce_impervious", "title": "Replace ~10% of paved area with permeable surface or plants",
+     "cost": 600, "hours": 16, "apply": _reduce_impervious},
+]
+
+ACTIONS_BY_ID = {a["id"]: a for a in ACTIONS}
+
+
+def _apply(action, columns):
+    out = {k: v.copy() for k, v in columns.items()}
+    action["apply"](out)
+    return out
+
+
+def _changes(action, base):
+    """True if the action changes any input of the base property."""
+    after = _apply(action, base)
+    return any(not np.array_equal(after[k], base[k]) for k in base)
+
+
+# ============ OPTIMIZER ============
+
+def build_scenarios(base, actions):
+    """
+    Columns for every combination of actions. Row r includes action i when
+    bit i of r is set: each action is applied to all rows built so far and
+    appended, so every combination extends an already-built prefix.
+    """
+    columns = base
+    for action in actions:
+        applied = _apply(action, columns)
+        columns = {k: np.concatenate([columns[k], applied[k]]) for k in columns}
+    return columns
+
+
+def pareto_front(costs, scores, sizes):
+    """Indices of plans not beaten on both cost and score (cheapest, then fewest actions, first)."""
+    order = np.lexsort((sizes, -scores, costs))
+    front, best = [], -np.inf
+    for i in order:
+        if scores[i] > best:
+            front.append(i)
+            best = scores[i]
+    return front
+
+
+def optimize_property(data: PropertyData, action_ids=None, budget=None, max_plans=20):
+    """
+    Find the best improvement plans for a property.
+
+    Returns the current score, each applicable action's stand-alone gain and
+    the Pareto-optimal plans (cost vs score) within budget.
+    """
+    if action_ids is not None and not isinstance(action_ids, (list, tuple, set)):
+        raise ValueError("action_ids must be a list of action ids")
+    if max_plans < 0:
+        raise ValueError("max_plans must be zero or more")
+    started = time.perf_counter()
+    candidates = [ACTIONS_BY_ID[a] for a in action_ids if a in ACTIONS_BY_ID] if action_ids is not None else ACTIONS
+    base = columns_from_properties([data])
+    actions = [a for a in candidates if _changes(a, base)]
+    if budget is not None:
+        actions = [a for a in actions if a["cost"] <= budget]
+    # Prefer the actions with the best stand-alone gain when there are too many
+    if len(actions) > MAX_ACTIONS:
+        singles = [base] + [_apply(a, base) for a in actions]
+        scores = score_properties({k: np.concatenate([s[k] for s in singles]) for k in base})["final_score"]
+        ranked = sorted(range(len(actions)), key=lambda j: (-(scores[j + 1] - scores[0]), actions[j]["cost"]))
+        actions = [actions[j] for j in sorted(ranked[:MAX_ACTIONS])]
+
+    table = score_properties(build_scenarios(base, actions))
+    scores = table["final_score"]
+    n = len(actions)
+    bits = (np.arange(len(scores))[:, None] >> np.arange(n)) & 1
+    costs = bits @ np.array([a["cost"] for a in actions], dtype=float)
+    hours = bits @ np.array([a["hours"] for a in actions], dtype=float)
+    sizes = bits.sum(axis=1)
+
+    within = np.ones(len(scores), dtype=bool) if budget is None else costs <= budget
+    candidates_idx = np.flatnonzero(within)
+    front = [candidates_idx[i] for i in pareto_front(costs[within], scores[within], sizes[within])]
+
+    base_score = float(scores[0])
+    plans = [{
+        "actions": [actions[j]["id"] for j in range(n) if bits[i, j]],
+        "cost": float(costs[i]),
+        "hours": float(hours[i]),
+        "score": round(float(scores[i]), 1),
+        "gain": round(float(scores[i]) - base_score, 1),
+        "grade": str(table["grade"][i]),
+    } for i in front[:max_plans]]
+
+    return {
+        "current": {"score": round(base_score, 1), "grade": str(table["grade"][0])},
+        "actions": [{
+            "id": a["id"],
+            "title": a["title"],
+            "cost": a["cost"],
+            "hours": a["hours"],
+            "gain": round(float(scores[1 << j]) - base_score, 1),
+        } for j, a in enumerate(actions)],
+        "plans": plans,
+        "scenarios": len(scores),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,328 @@
+"""
+Batch Habitat Scoring (columnar)
+=================================
+Vectorized version of scoring_v2.score_property for many properties at once.
+Inputs are arrays of PropertyData fields (plant lists reduced to per-property
+counts); the output is a ScoreBreakdown table of arrays. Thresholds come
+from the same compiled rules as scoring_v2 (scoring_rules), evaluated with
+searchsorted/where, and results match the scalar path exactly (see
+compare_with_scalar).
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from scoring_rules import get_rules
+from scoring_v2 import PropertyData, ScoreBreakdown, Season, score_property
+
+
+# Per-property input columns and their PropertyData defaults.
+# Plant lists are reduced to the counts the scoring ladders look at.
+COLUMN_DEFAULTS = {
+    "plant_species": 0,          # len(plants)
+    "native_species": 0,         # plants with is_native
+    "milkweed_count": 0,         # sum of count over milkweed plants
+    "blooms_spring": False,
+    "blooms_summer": False,
+    "blooms_fall": False,
+    "estimated_flower_coverage_pct": 0.0,
+    "has_bare_ground": False,
+    "bare_ground_sqft": 0.0,
+    "has_dead_wood": False,
+    "has_brush_pile": False,
+    "has_bee_hotel": False,
+    "leaves_stems_over_winter": False,
+    "neighbors_in_program": 0,
+    "green_space_within_500m": 0.0,
+    "uses_pesticides": False,
+    "pesticide_frequency": "never",
+    "mowing_frequency": "weekly",
+    "lot_size_sqft": 5000.0,
+    "impervious_surface_pct": 30.0,
+}
+
+# ScoreBreakdown fields produced by score_properties (everything but recommendations)
+BREAKDOWN_FIELDS = [
+    "floral_score", "nesting_score", "connectivity_score", "connectivity_pioneer",
+    "management_score", "floral_diversity", "floral_coverage", "floral_spring",
+    "floral_summer", "floral_fall", "floral_milkweed_bonus", "nesting_ground",
+    "nesting_cavity", "nesting_undisturbed", "impervious_penalty", "raw_score",
+    "final_score", "grade", "confidence", "data_completeness",
+]
+
+
+# ============ LADDERS ============
+
+def ladder(x, compiled):
+    """Look up each x in a compiled scoring_rules.Ladder (x >= threshold moves up a step)."""
+    return np.asarray(compiled.values)[np.searchsorted(compiled.thresholds, x, side="right")]
+
+
+def choice(answers, compiled):
+    """Points for each categorical answer from a compiled scoring_rules.Choice."""
+    points = np.full(answers.shape, compiled.default, dtype=float)
+    for answer, value in compiled.points.items():
+        points[answers == answer] = value
+    return points
+
+
+# ============ COLUMNS ============
+
+def columns_from_properties(properties: List[PropertyData]) -> Dict[str, np.ndarray]:
+    """Build input columns from PropertyData objects."""
+    cols = {name: [] for name in COLUMN_DEFAULTS}
+    for data in properties:
+        plants = data.plants
+        seasons = {season for p in plants for season in p.bloom_seasons}
+        cols["plant_species"].append(len(plants))
+        cols["native_species"].append(len([p for p in plants if p.is_native]))
+        cols["milkweed_count"].append(sum(p.count for p in plants if p.is_milkweed))
+        cols["blooms_spring"].append(Season.SPRING in seasons)
+        cols["blooms_summer"].append(Season.SUMMER in seasons)
+        cols["blooms_fall"].append(Season.FALL in seasons)
+        for name in COLUMN_DEFAULTS:
+            if hasattr(data, name):
+                cols[name].append(getattr(data, name))
+    return normalize_columns(cols, len(properties))
+
+
+def normalize_columns(columns, size=None) -> Dict[str, np.ndarray]:
+    """Fill missing columns with PropertyData defaults and convert everything to arrays."""
+    if size is None:
+        size = max((len(v) for v in columns.values()), default=0)
+    out = {}
+    for name, default in COLUMN_DEFAULTS.items():
+        values = columns.get(name)
+        if values is None:
+            values = [default] * size
+        if isinstance(default, bool):
+            out[name] = np.asarray(values, dtype=bool)
+        elif isinstance(default, str):
+            out[name] = np.asarray(values, dtype=str)
+        else:
+            out[name] = np.asarray(values, dtype=float)
+    return out
+
+
+# ============ COMPONENTS ============
+
+def score_floral_columns(c, rules):
+    """Floral resources (35 max), per scoring_v2.score_floral_resources."""
+    points, caps = rules.points, rules.caps
+    diversity = ladder(c["native_species"], rules.ladder("native_diversity")).astype(float)
+    non_native_bonus = np.minimum((c["plant_species"] - c["native_species"]) * points["non_native_species"],
+                                  caps["non_native_bonus"])
+    diversity = np.minimum(diversity + non_native_bonus, caps["diversity"])
+
+    coverage = ladder(c["estimated_flower_coverage_pct"], rules.ladder("flower_coverage")).astype(float)
+    spring = np.where(c["blooms_spring"], float(points["spring_blooms"]), 0.0)
+    summer = np.where(c["blooms_summer"], float(points["summer_blooms"]), 0.0)
+    fall = np.where(c["blooms_fall"], float(points["fall_blooms"]), 0.0)
+    milkweed = ladder(c["milkweed_count"], rules.ladder("milkweed_count")).astype(float)
+
+    total = np.minimum(diversity + coverage + spring + summer + fall + milkweed, caps["floral"])
+    return {"diversity": diversity, "coverage": coverage, "spring": spring,
+            "summer": summer, "fall": fall, "milkweed_bonus": milkweed, "total": total}
+
+
+def score_nesting_columns(c, rules):
+    """Nesting habitat (30 max), per scoring_v2.score_nesting_habitat."""
+    points, caps = rules.points, rules.caps
+    ground = np.where(c["has_bare_ground"],
+                      ladder(c["bare_ground_sqft"], rules.ladder("bare_ground_sqft")), 0).astype(float)
+    cavity = np.minimum(np.where(c["has_dead_wood"], float(points["dead_wood"]), 0.0)
+                        + np.where(c["has_bee_hotel"], float(points["bee_hotel"]), 0.0)
+                        + np.where(c["has_brush_pile"], float(points["brush_pile_cavity"]), 0.0),
+                        caps["cavity"])
+
+    undisturbed = np.minimum(
+        np.where(c["leaves_stems_over_winter"], float(points["leaves_stems_over_winter"]), 0.0)
+        + choice(c["mowing_frequency"], rules.choice("mowing"))
+        + np.where(c["has_brush_pile"], float(points["brush_pile_undisturbed"]), 0.0),
+        caps["undisturbed"])
+
+    return {"ground": ground, "cavity": cavity, "undisturbed": undisturbed,
+            "total": ground + cavity + undisturbed}
+
+
+def score_connectivity_columns(c, rules):
+    """Connectivity (20 max), per scoring_v2.score_connectivity."""
+    points = rules.points
+    n = c["neighbors_in_program"]
+    pioneer = np.select([n == 0, n <= 2], [float(points["pioneer"]), float(points["early_adopter"])], 0.0)
+    neighbors = np.select([n == 0, n <= 2], [0.0, n * points["per_early_neighbor"]],
+                          ladder(n, rules.ladder("established_neighbors")))
+    green = ladder(c["green_space_within_500m"], rules.ladder("green_space_pct")).astype(float)
+    return {"neighbors": neighbors, "green_space": green, "pioneer_bonus": pioneer,
+            "total": np.minimum(neighbors + green + pioneer, rules.caps["connectivity"])}
+
+
+def score_management_columns(c, rules):
+    """Management (15 max), per scoring_v2.score_management."""
+    pesticide = rules.choice("pesticide")
+    pesticide_free = np.where(c["uses_pesticides"], choice(c["pesticide_frequency"], pesticide),
+                              float(pesticide("never")))
+
+    total_plants = c["plant_species"]
+    has_plants = total_plants > 0
+    native_pct = np.divide(c["native_species"], total_plants,
+                           out=np.zeros_like(total_plants), where=has_plants) * 100
+    native_proportion = np.where(has_plants, ladder(native_pct, rules.ladder("native_plant_pct")), 0).astype(float)
+
+    return {"pesticide_free": pesticide_free, "native_proportion": native_proportion,
+            "total": pesticide_free + native_proportion}
+
+
+def impervious_penalty_columns(c, rules):
+    """Impervious surface penalty (0 to -10), per scoring_v2.calculate_impervious_penalty."""
+    config = rules.impervious
+    pct = c["impervious_surface_pct"]
+    penalty = np.minimum((pct - config["threshold_pct"]) * config["penalty_per_pct"], config["max_penalty"])
+    return np.where(pct <= config["threshold_pct"], 0.0, -penalty)
+
+
+def data_completeness_columns(c):
+    """Share of fields provided (0-100), per scoring_v2.calculate_data_completeness."""
+    provided = (
+        (c["plant_species"] > 0).astype(int)
+        + (c["estimated_flower_coverage_pct"] > 0)
+        + (c["has_bare_ground"] | (c["bare_ground_sqft"] > 0))
+        + (c["has_dead_wood"] | c["has_bee_hotel"] | c["has_brush_pile"])
+        + c["leaves_stems_over_winter"]
+        + (c["mowing_frequency"] != "weekly")
+        + (c["pesticide_frequency"] != "never")
+        + (c["lot_size_sqft"] != 5000)
+        + (c["impervious_surface_pct"] != 30)
+        + (c["neighbors_in_program"] > 0)
+    )
+    return (provided / 10) * 100
+
+
+# ============ MAIN ============
+
+def score_properties(columns) -> Dict[str, np.ndarray]:
+    """
+    Score many properties at once.
+
+    `columns` maps COLUMN_DEFAULTS names to equal-length sequences (missing
+    columns take the PropertyData default). Returns BREAKDOWN_FIELDS -> arrays.
+    Recommendations are not generated; use score_property for a single property.
+    """
+    rules = get_rules()
+    c = normalize_columns(columns)
+    floral = score_floral_columns(c, rules)
+    nesting = score_nesting_columns(c, rules)
+    connectivity = score_connectivity_columns(c, rules)
+    management = score_management_columns(c, rules)
+    impervious = impervious_penalty_columns(c, rules)
+
+    raw = floral["total"] + nesting["total"] + connectivity["total"] + management["total"]
+    final = np.maximum(0, np.minimum(100, raw + impervious))
+    completeness = data_completeness_columns(c)
+
+    return {
+        "floral_score": floral["total"],
+        "nesting_score": nesting["total"],
+        "connectivity_score": connectivity["total"],
+        "connectivity_pioneer": np.zeros_like(raw),  # not set by score_property either
+        "management_score": management["total"],
+        "floral_diversity": floral["diversity"],
+        "floral_coverage": floral["coverage"],
+        "floral_spring": floral["spring"],
+        "floral_summer": floral["summer"],
+        "floral_fall": floral["fall"],
+        "floral_milkweed_bonus": floral["milkweed_bonus"],
+        "nesting_ground": nesting["ground"],
+        "nesting_cavity": nesting["cavity"],
+        "nesting_undisturbed": nesting["undisturbed"],
+        "impervious_penalty": impervious,
+        "raw_score": raw,
+        "final_score": final,
+        "grade": ladder(final, rules.ladder("grade")),
+        "confidence": ladder(completeness, rules.ladder("confidence")),
+        "data_completeness": completeness,
+    }
+
+
+def breakdown_at(table, i) -> ScoreBreakdown:
+    """Row i of a score table as a ScoreBreakdown (without recommendations)."""
+    return ScoreBreakdown(**{name: table[name][i].item() for name in BREAKDOWN_FIELDS})
+
+
+def compare_with_scalar(properties: List[PropertyData]) -> List[dict]:
+    """
+    Score properties both ways and return every field that differs.
+    Floats are compared bit-for-bit (after promoting scalar ints to float).
+    """
+    table = score_properties(columns_from_properties(properties))
+    mismatches = []
+    for i, data in enumerate(properties):
+        scalar = score_property(data)
+        for name in BREAKDOWN_FIELDS:
+            expected = getattr(scalar, name)
+            actual = table[name][i].item()
+            if isinstance(expected, str):
+                same = expected == actual
+            else:
+                same = np.float64(expected).tobytes() == np.float64(actual).tobytes()
+            if not same:
+                mismatches.append({"index": i, "field": name, "scalar": expected, "batch": actual})
+    return mismatches
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from scoring_v2 import PlantInventory
+
+    rng = random.Random(42)
+    frequencies = ["never", "rarely", "sometimes", "often"]
+    mowings = ["weekly", "biweekly", "monthly", "rarely"]
+
+    def random_property():
+        plants = [
+            PlantInventory(
+                f"plant{j}", rng.randint(0, 6),
+                rng.sample(list(Season), rng.randint(0, 3)),
+                is_native=rng.random() < 0.7, is_milkweed=rng.random() < 0.2)
+            for j in range(rng.randint(0, 14))
+        ]
+        return PropertyData(
+            lat=40.666, lng=-111.897, plants=plants,
+            estimated_flower_coverage_pct=rng.choice([0, 5, 9.99, 10, 20, 29.5, 30, rng.uniform(0, 60)]),
+            has_bare_ground=rng.random() < 0.5,
+            bare_ground_sqft=rng.choice([0, 10, 25, 50, rng.uniform(0, 80)]),
+            has_dead_wood=rng.random() < 0.4, has_brush_pile=rng.random() < 0.4,
+            has_bee_hotel=rng.random() < 0.4, leaves_stems_over_winter=rng.random() < 0.5,
+            neighbors_in_program=rng.randint(0, 8),
+            green_space_within_500m=rng.choice([0, 5, 10, 20, 30, rng.uniform(0, 50)]),
+            uses_pesticides=rng.random() < 0.5, pesticide_frequency=rng.choice(frequencies),
+            mowing_frequency=rng.choice(mowings),
+            lot_size_sqft=rng.choice([5000, rng.uniform(1000, 20000)]),
+            impervious_surface_pct=rng.choice([22, 30, rng.uniform(0, 90)]),
+        )
+
+    properties = [random_property() for _ in range(20000)]
+
+    # Equivalence with score_property is checked in tests/test_scoring_batch.py
+    print("=" * 60)
+    print("Batch scoring vs scoring_v2.score_property (timing)")
+    print("=" * 60)
+
+    start = time.time()
+    for data in properties:
+        score_property(data)
+    scalar_seconds = time.time() - start
+
+    columns = columns_from_properties(properties)
+    start = time.time()
+    score_properties(columns)
+    batch_seconds = time.time() - start
+    print(f"   Scalar: {scalar_seconds:.3f}s, batch: {batch_seconds:.3f}s "
+          f"({scalar_seconds / batch_seconds:.0f}x)")
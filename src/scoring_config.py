@@ -2,9 +2,12 @@
 Scoring Configuration
 ======================
 Dynamic weights and versioning for model validation.
-Change weights here to test different models.
+Change weights here to test different models; thresholds and points for
+the active model come from the compiled scoring rules (scoring_rules).
 """
 
+from scoring_rules import get_rules, get_rules_stats, reload_rules
+
 # Current active model version
 ACTIVE_MODEL_VERSION = "2.0.0"
 
@@ -23,116 +26,9 @@ SCORING_MODELS = {
             "management": 15,
         },
         
-        # Floral sub-weights
-        "floral_config": {
-            "diversity_max": 12,
-            "coverage_max": 8,
-            "spring_points": 2,
-            "summer_points": 2,
-            "fall_points": 6,  # 1.5-2x weight for September
-            "milkweed_max": 5,
-            
-            # Diversity thresholds
-            "diversity_tiers": [
-                {"min_species": 10, "points": 12},
-                {"min_species": 7, "points": 10},
-                {"min_species": 5, "points": 8},
-                {"min_species": 3, "points": 5},
-                {"min_species": 1, "points": 2},
-            ],
-            
-            # Coverage thresholds
-            "coverage_tiers": [
-                {"min_pct": 30, "points": 8},
-                {"min_pct": 20, "points": 6},
-                {"min_pct": 10, "points": 4},
-                {"min_pct": 5, "points": 2},
-            ],
-        },
-        
-        # Nesting sub-weights
-        "nesting_config": {
-            "ground_max": 10,
-            "cavity_max": 10,
-            "undisturbed_max": 10,
-            
-            # Ground nesting sqft thresholds
-            "ground_tiers": [
-                {"min_sqft": 50, "points": 10},
-                {"min_sqft": 25, "points": 7},
-                {"min_sqft": 10, "points": 5},
-                {"min_sqft": 1, "points": 3},
-            ],
-            
-            # Cavity features
-            "dead_wood_points": 4,
-            "bee_hotel_points": 3,
-            "brush_pile_points": 3,
-            "hollow_stems_points": 2,
-            
-            # Undisturbed
-            "leaves_winter_points": 5,
-            "leaf_litter_points": 2,
-            "mowing_points": {
-                "never": 3,
-                "monthly": 2,
-                "biweekly": 1,
-                "weekly": 0,
-            },
-        },
-        
-        # Connectivity config
-        "connectivity_config": {
-            "pioneer_bonus": 8,
-            "early_adopter_bonus": 4,
-            "neighbor_tiers": [
-                {"min_neighbors": 5, "points": 10},
-                {"min_neighbors": 3, "points": 7},
-                {"min_neighbors": 2, "points": 5},
-                {"min_neighbors": 1, "points": 3},
-            ],
-            "green_space_tiers": [
-                {"level": "large", "points": 10},
-                {"level": "medium", "points": 7},
-                {"level": "small", "points": 4},
-                {"level": "none", "points": 2},
-            ],
-        },
-        
-        # Management config
-        "management_config": {
-            "pesticide_free_max": 8,
-            "native_pct_max": 7,
-            
-            "pesticide_points": {
-                "never": 8,
-                "rarely": 5,
-                "sometimes": 2,
-                "often": 0,
-            },
-            
-            "native_tiers": [
-                {"min_pct": 80, "points": 7},
-                {"min_pct": 60, "points": 5},
-                {"min_pct": 40, "points": 3},
-                {"min_pct": 20, "points": 1},
-            ],
-        },
-        
-        # Impervious penalty
-        "impervious_config": {
-            "threshold_pct": 22,  # Berlin study R²=0.84
-            "penalty_per_pct": 0.35,
-            "max_penalty": 10,
-        },
-        
-        # Grade thresholds
-        "grade_thresholds": {
-            "A+": 90, "A": 85, "A-": 80,
-            "B+": 75, "B": 70, "B-": 65,
-            "C+": 60, "C": 55, "C-": 50,
-            "D": 40,
-        },
+        # Thresholds and points live in config/scoring_rules.yaml (shared with
+        # scoring_v2, assessments_api and scoring_batch); see get_model().
+        "rules_file": "config/scoring_rules.yaml",
         
         # Research citations
         "citations": [
@@ -162,14 +58,21 @@ SCORING_MODELS = {
 }
 
 
+def _with_rules(model):
+    """Attach the compiled thresholds/points to a model that uses the rules file."""
+    if model is None or "rules_file" not in model:
+        return model
+    return {**model, "rules": get_rules().describe()}
+
+
 def get_active_model():
     """Get the currently active scoring model config."""
-    return SCORING_MODELS.get(ACTIVE_MODEL_VERSION, SCORING_MODELS["2.0.0"])
+    return _with_rules(SCORING_MODELS.get(ACTIVE_MODEL_VERSION, SCORING_MODELS["2.0.0"]))
 
 
 def get_model(version):
     """Get a specific model version."""
-    return SCORING_MODELS.get(version)
+    return _with_rules(SCORING_MODELS.get(version))
 
 
 def get_model_version():
@@ -193,6 +96,7 @@ def list_models():
 def register_config_routes(app):
     """Register scoring config API routes."""
     from flask import jsonify
+    from admin_auth import require_admin
     
     @app.route('/api/scoring/models', methods=['GET'])
     def list_scoring_models():
@@ -219,12 +123,26 @@ def register_config_routes(app):
     def get_methodology():
         """Get current scoring methodology for transparency."""
         model = get_active_model()
+        rules = get_rules()
         return jsonify({
             "version": get_model_version(),
+            "rules_version": rules.version,
             "name": model.get("name"),
             "description": model.get("description"),
             "weights": model.get("weights"),
             "citations": model.get("citations"),
-            "impervious_threshold": model.get("impervious_config", {}).get("threshold_pct"),
-            "fall_bloom_weight": f"{model.get('floral_config', {}).get('fall_points', 6)} points (1.5-2x standard)",
+            "impervious_threshold": rules.impervious.get("threshold_pct"),
+            "fall_bloom_weight": f"{rules.points.get('fall_blooms', 6)} points (1.5-2x standard)",
         })
+    
+    @app.route('/api/scoring/rules', methods=['GET'])
+    def get_scoring_rules():
+        """Compiled scoring rules currently in use, with their version stamp."""
+        return jsonify({**get_rules().describe(), "stats": get_rules_stats()})
+    
+    @app.route('/api/scoring/rules/reload', methods=['POST'])
+    @require_admin
+    def reload_scoring_rules():
+        """Re-read config/scoring_rules.yaml now instead of waiting for the next check."""
+        rules = reload_rules(force=True)
+        return jsonify({"version": rules.version, "stats": get_rules_stats()})
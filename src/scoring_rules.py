@@ -0,0 +1,192 @@
+"""
+Scoring Rules
+==============
+Loads habitat scoring thresholds and points from config/scoring_rules.yaml
+and compiles each ladder into sorted breakpoint arrays evaluated with bisect.
+The file is re-read when it changes; every compiled set carries a version
+stamp so scores can be traced to the rules that produced them.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from bisect import bisect_right
+
+import yaml
+
+RULES_PATH = os.environ.get(
+    "SCORING_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "config", "scoring_rules.yaml"),
+)
+
+# How often (seconds) get_rules() checks the file for changes
+RELOAD_CHECK_SECONDS = 5
+
+# Names the scorers look up; a rules file missing any of them is rejected
+REQUIRED = {
+    "ladders": ["native_diversity", "flower_coverage", "milkweed_count", "bare_ground_sqft",
+                "established_neighbors", "assessment_neighbors", "green_space_pct",
+                "native_plant_pct", "grade", "assessment_grade", "confidence"],
+    "choices": ["milkweed_present", "mowing", "assessment_mowing", "pesticide", "green_space_nearby"],
+    "points": ["spring_blooms", "summer_blooms", "fall_blooms", "non_native_species", "dead_wood",
+               "bee_hotel", "brush_pile_cavity", "hollow_stems", "sandy_areas", "sunny_ground",
+               "leaves_stems_over_winter", "leaf_litter", "brush_pile_undisturbed", "pioneer",
+               "early_adopter", "per_early_neighbor"],
+    "caps": ["non_native_bonus", "diversity", "floral", "ground", "cavity", "undisturbed", "connectivity"],
+    "impervious": ["threshold_pct", "penalty_per_pct", "max_penalty"],
+}
+
+_state = {
+    "rules": None,
+    "mtime": None,
+    "checked_at": 0,
+    "loaded_at": None,
+    "reloads": 0,
+    "last_error": None,
+}
+_lock = threading.Lock()
+
+
+class Ladder:
+    """Threshold ladder compiled to ascending breakpoints; lookups are O(log k)."""
+
+    __slots__ = ("name", "thresholds", "values")
+
+    def __init__(self, name, floor, steps):
+        steps = sorted((float(t), v) for t, v in steps)
+        thresholds = [t for t, _ in steps]
+        if len(set(thresholds)) != len(thresholds):
+            raise ValueError(f"ladder {name!r} has duplicate thresholds")
+        self.name = name
+        self.thresholds = thresholds
+        # values[i] applies when thresholds[i-1] <= x < thresholds[i]
+        self.values = [floor] + [v for _, v in steps]
+
+    def __call__(self, x):
+        return self.values[bisect_right(self.thresholds, x)]
+
+    def tiers(self):
+        """Highest-first list of {"min": threshold, "points": value} (for display)."""
+        tiers = [{"min": t, "points": v} for t, v in zip(self.thresholds, self.values[1:])]
+        return tiers[::-1] + [{"min": None, "points": self.values[0]}]
+
+
+class Choice:
+    """Points for a categorical answer."""
+
+    __slots__ = ("name", "points", "default")
+
+    def __init__(self, name, points, default=0):
+        self.name = name
+        self.points = dict(points)
+        self.default = default
+
+    def __call__(self, answer):
+        return self.points.get(answer, self.default)
+
+
+class ScoringRules:
+    """One compiled, immutable set of rules."""
+
+    def __init__(self, config, version):
+        self.version = version
+        self.model_version = str(config.get("model_version", ""))
+        self.ladders = {name: Ladder(name, spec.get("floor", 0), spec["steps"])
+                        for name, spec in (config.get("ladders") or {}).items()}
+        self.choices = {name: Choice(name, spec.get("points") or {}, spec.get("default", 0))
+                        for name, spec in (config.get("choices") or {}).items()}
+        self.points = dict(config.get("points") or {})
+        self.caps = dict(config.get("caps") or {})
+        self.impervious = dict(config.get("impervious") or {})
+        for section, names in REQUIRED.items():
+            missing = [name for name in names if name not in getattr(self, section)]
+            if missing:
+                raise ValueError(f"{section} missing: {', '.join(missing)}")
+
+    def ladder(self, name):
+        return self.ladders[name]
+
+    def choice(self, name):
+        return self.choices[name]
+
+    def impervious_penalty(self, pct):
+        """0 up to the threshold, then -penalty_per_pct per % above it, capped at -max_penalty."""
+        threshold = self.impervious["threshold_pct"]
+        if pct <= threshold:
+            return 0
+        return -min((pct - threshold) * self.impervious["penalty_per_pct"],
+                    self.impervious["max_penalty"])
+
+    def describe(self):
+        return {
+            "version": self.version,
+            "model_version": self.model_version,
+            "ladders": {name: l.tiers() for name, l in self.ladders.items()},
+            "choices": {name: {"points": c.points, "default": c.default}
+                        for name, c in self.choices.items()},
+            "points": self.points,
+            "caps": self.caps,
+            "impervious": self.impervious,
+        }
+
+
+def compile_rules(text):
+    """Compile YAML rules text into ScoringRules (raises on invalid rules)."""
+    config = yaml.safe_load(text) or {}
+    digest = hashlib.sha1(text.encode()).hexdigest()[:8]
+    return ScoringRules(config, f"{config.get('model_version', '0')}+{digest}")
+
+
+def reload_rules(force=False):
+    """
+    Re-read the rules file if it changed (or force). A file that fails to
+    compile leaves the previous rules in place and is reported in last_error.
+    """
+    with _lock:
+        _state["checked_at"] = time.time()
+        try:
+            mtime = os.path.getmtime(RULES_PATH)
+        except OSError as e:
+            if _state["rules"] is None:
+                raise
+            _state["last_error"] = str(e)
+            return _state["rules"]
+        if not force and _state["rules"] is not None and mtime == _state["mtime"]:
+            return _state["rules"]
+        try:
+            with open(RULES_PATH) as f:
+                rules = compile_rules(f.read())
+        except Exception as e:
+            if _state["rules"] is None:
+                raise
+            _state["last_error"] = f"{type(e).__name__}: {e}"
+            print(f"Scoring rules reload failed, keeping {_state['rules'].version}: {e}")
+            return _state["rules"]
+        if _state["rules"] is not None and rules.version != _state["rules"].version:
+            _state["reloads"] += 1
+        _state.update(rules=rules, mtime=mtime, loaded_at=time.time(), last_error=None)
+        return rules
+
+
+def get_rules():
+    """Current compiled rules, re-checking the file at most every RELOAD_CHECK_SECONDS."""
+    rules = _state["rules"]
+    if rules is None or time.time() - _state["checked_at"] >= RELOAD_CHECK_SECONDS:
+        rules = reload_rules()
+    return rules
+
+
+def get_rules_version():
+    return get_rules().version
+
+
+def get_rules_stats():
+    rules = get_rules()
+    return {
+        "version": rules.version,
+        "path": os.path.abspath(RULES_PATH),
+        "loaded_at": _state["loaded_at"],
+        "reloads": _state["reloads"],
+        "last_error": _state["last_error"],
+    }
@@ -12,10 +12,14 @@ Key insight: September resources get 1.5-2× weight due to
 84.5% nectar deficit during peak pollinator activity.
 """
 
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+from scoring_rules import get_rules
+
 
 class Season(Enum):
     SPRING = "spring"      # March-May
@@ -120,6 +124,7 @@ def score_floral_resources(data: PropertyData) -> Dict[str, float]:
     - Fall resources get 1.5-2× weight (84.5% deficit finding)
     """
     
+    rules = get_rules()
     scores = {
         "diversity": 0,
         "coverage": 0,
@@ -137,31 +142,15 @@ def score_floral_resources(data: PropertyData) -> Dict[str, float]:
     native_species = len([p for p in plants if p.is_native])
     total_species = len(plants)
     
-    if native_species >= 10:
-        scores["diversity"] = 12
-    elif native_species >= 7:
-        scores["diversity"] = 10
-    elif native_species >= 5:
-        scores["diversity"] = 8
-    elif native_species >= 3:
-        scores["diversity"] = 5
-    elif native_species >= 1:
-        scores["diversity"] = 2
+    scores["diversity"] = rules.ladder("native_diversity")(native_species)
     
     # Bonus for non-native but beneficial (capped)
-    non_native_bonus = min((total_species - native_species) * 0.5, 2)
-    scores["diversity"] = min(scores["diversity"] + non_native_bonus, 12)
+    non_native_bonus = min((total_species - native_species) * rules.points["non_native_species"],
+                           rules.caps["non_native_bonus"])
+    scores["diversity"] = min(scores["diversity"] + non_native_bonus, rules.caps["diversity"])
     
     # COVERAGE: 0-8 points
-    coverage = data.estimated_flower_coverage_pct
-    if coverage >= 30:
-        scores["coverage"] = 8
-    elif coverage >= 20:
-        scores["coverage"] = 6
-    elif coverage >= 10:
-        scores["coverage"] = 4
-    elif coverage >= 5:
-        scores["coverage"] = 2
+    scores["coverage"] = rules.ladder("flower_coverage")(data.estimated_flower_coverage_pct)
     
     # SEASONAL CONTINUITY: Spring 2, Summer 2, Fall 6 (WEIGHTED)
     seasons_covered = {Season.SPRING: False, Season.SUMMER: False, Season.FALL: False}
@@ -171,20 +160,15 @@ def score_floral_resources(data: PropertyData) -> Dict[str, float]:
             seasons_covered[season] = True
     
     if seasons_covered[Season.SPRING]:
-        scores["spring"] = 2
+        scores["spring"] = rules.points["spring_blooms"]
     if seasons_covered[Season.SUMMER]:
-        scores["summer"] = 2
+        scores["summer"] = rules.points["summer_blooms"]
     if seasons_covered[Season.FALL]:
-        scores["fall"] = 6  # 1.5-2× weight for September
+        scores["fall"] = rules.points["fall_blooms"]  # 1.5-2× weight for September
     
     # MILKWEED BONUS: 0-5 points
     milkweed_count = sum(p.count for p in plants if p.is_milkweed)
-    if milkweed_count >= 5:
-        scores["milkweed_bonus"] = 5
-    elif milkweed_count >= 3:
-        scores["milkweed_bonus"] = 4
-    elif milkweed_count >= 1:
-        scores["milkweed_bonus"] = 3
+    scores["milkweed_bonus"] = rules.ladder("milkweed_count")(milkweed_count)
     
     # TOTAL (capped at 35)
     scores["total"] = min(
@@ -194,7 +178,7 @@ def score_floral_resources(data: PropertyData) -> Dict[str, float]:
         scores["summer"] + 
         scores["fall"] + 
         scores["milkweed_bonus"],
-        35
+        rules.caps["floral"]
     )
     
     return scores
@@ -211,6 +195,8 @@ def score_nesting_habitat(data: PropertyData) -> Dict[str, float]:
     - Undisturbed areas critical for overwintering
     """
     
+    rules = get_rules()
+    points = rules.points
     scores = {
         "ground": 0,
         "cavity": 0,
@@ -221,36 +207,26 @@ def score_nesting_habitat(data: PropertyData) -> Dict[str, float]:
     # GROUND NESTING: 0-10 points
     # 70% of native bees are ground nesters
     if data.has_bare_ground:
-        if data.bare_ground_sqft >= 50:
-            scores["ground"] = 10
-        elif data.bare_ground_sqft >= 25:
-            scores["ground"] = 7
-        elif data.bare_ground_sqft >= 10:
-            scores["ground"] = 5
-        else:
-            scores["ground"] = 3
+        scores["ground"] = rules.ladder("bare_ground_sqft")(data.bare_ground_sqft)
     
     # CAVITY NESTING: 0-10 points
     cavity_features = 0
     if data.has_dead_wood:
-        cavity_features += 4
+        cavity_features += points["dead_wood"]
     if data.has_bee_hotel:
-        cavity_features += 3
+        cavity_features += points["bee_hotel"]
     if data.has_brush_pile:
-        cavity_features += 3
-    scores["cavity"] = min(cavity_features, 10)
+        cavity_features += points["brush_pile_cavity"]
+    scores["cavity"] = min(cavity_features, rules.caps["cavity"])
     
     # UNDISTURBED AREAS: 0-10 points
     undisturbed = 0
     if data.leaves_stems_over_winter:
-        undisturbed += 5  # Critical for overwintering
-    if data.mowing_frequency in ["monthly", "rarely"]:
-        undisturbed += 3
-    elif data.mowing_frequency == "biweekly":
-        undisturbed += 1
+        undisturbed += points["leaves_stems_over_winter"]  # Critical for overwintering
+    undisturbed += rules.choice("mowing")(data.mowing_frequency)
     if data.has_brush_pile:
-        undisturbed += 2
-    scores["undisturbed"] = min(undisturbed, 10)
+        undisturbed += points["brush_pile_undisturbed"]
+    scores["undisturbed"] = min(undisturbed, rules.caps["undisturbed"])
     
     scores["total"] = scores["ground"] + scores["cavity"] + scores["undisturbed"]
     
@@ -266,6 +242,7 @@ def score_connectivity(data: PropertyData) -> Dict[str, float]:
     - Weight shifts to neighbor count as network grows
     """
     
+    rules = get_rules()
     scores = {
         "neighbors": 0,
         "green_space": 0,
@@ -277,36 +254,21 @@ def score_connectivity(data: PropertyData) -> Dict[str, float]:
     
     # PIONEER BONUS: Rewards being first
     if neighbors == 0:
-        scores["pioneer_bonus"] = 8  # First in area
+        scores["pioneer_bonus"] = rules.points["pioneer"]  # First in area
         scores["neighbors"] = 0
     elif neighbors <= 2:
-        scores["pioneer_bonus"] = 4  # Early adopter
-        scores["neighbors"] = neighbors * 2
+        scores["pioneer_bonus"] = rules.points["early_adopter"]  # Early adopter
+        scores["neighbors"] = neighbors * rules.points["per_early_neighbor"]
     else:
         scores["pioneer_bonus"] = 0  # Established network
-        if neighbors >= 5:
-            scores["neighbors"] = 10
-        elif neighbors >= 3:
-            scores["neighbors"] = 7
-        else:
-            scores["neighbors"] = 5
-    
-    # GREEN SPACE WITHIN 500m
-    green_pct = data.green_space_within_500m
-    if green_pct >= 30:
-        scores["green_space"] = 10
-    elif green_pct >= 20:
-        scores["green_space"] = 7
-    elif green_pct >= 10:
-        scores["green_space"] = 5
-    elif green_pct >= 5:
-        scores["green_space"] = 3
-    else:
-        scores["green_space"] = 2  # Baseline for urban
+        scores["neighbors"] = rules.ladder("established_neighbors")(neighbors)
+    
+    # GREEN SPACE WITHIN 500m (floor is the urban baseline)
+    scores["green_space"] = rules.ladder("green_space_pct")(data.green_space_within_500m)
     
     scores["total"] = min(
         scores["neighbors"] + scores["green_space"] + scores["pioneer_bonus"],
-        20
+        rules.caps["connectivity"]
     )
     
     return scores
@@ -322,6 +284,7 @@ def score_management(data: PropertyData) -> Dict[str, float]:
     - Native plant proportion indicates long-term sustainability
     """
     
+    rules = get_rules()
     scores = {
         "pesticide_free": 0,
         "native_proportion": 0,
@@ -329,26 +292,17 @@ def score_management(data: PropertyData) -> Dict[str, float]:
     }
     
     # PESTICIDE-FREE: 0-8 points
-    if not data.uses_pesticides or data.pesticide_frequency == "never":
-        scores["pesticide_free"] = 8
-    elif data.pesticide_frequency == "rarely":
-        scores["pesticide_free"] = 5
-    elif data.pesticide_frequency == "sometimes":
-        scores["pesticide_free"] = 2
-    # "often" = 0
+    pesticide = rules.choice("pesticide")
+    if not data.uses_pesticides:
+        scores["pesticide_free"] = pesticide("never")
+    else:
+        scores["pesticide_free"] = pesticide(data.pesticide_frequency)  # "often" = 0
     
     # NATIVE PROPORTION: 0-7 points
     total_plants = len(data.plants)
     if total_plants > 0:
         native_pct = len([p for p in data.plants if p.is_native]) / total_plants * 100
-        if native_pct >= 80:
-            scores["native_proportion"] = 7
-        elif native_pct >= 60:
-            scores["native_proportion"] = 5
-        elif native_pct >= 40:
-            scores["native_proportion"] = 3
-        elif native_pct >= 20:
-            scores["native_proportion"] = 1
+        scores["native_proportion"] = rules.ladder("native_plant_pct")(native_pct)
     
     scores["total"] = scores["pesticide_free"] + scores["native_proportion"]
     
@@ -365,17 +319,8 @@ def calculate_impervious_penalty(data: PropertyData) -> float:
     - Each % above threshold warrants proportional reduction
     """
     
-    THRESHOLD = 22  # Research-based threshold
-    MAX_PENALTY = 10
-    
-    if data.impervious_surface_pct <= THRESHOLD:
-        return 0
-    
     # Penalty scales from 0 at 22% to -10 at 50%+
-    excess = data.impervious_surface_pct - THRESHOLD
-    penalty = min(excess * 0.35, MAX_PENALTY)
-    
-    return -penalty
+    return get_rules().impervious_penalty(data.impervious_surface_pct)
 
 
 def calculate_data_completeness(data: PropertyData) -> float:
@@ -482,28 +427,12 @@ def generate_recommendations(data: PropertyData, scores: ScoreBreakdown) -> List
 
 def get_grade(score: float) -> str:
     """Convert numeric score to letter grade."""
-    if score >= 90:
-        return "A+"
-    elif score >= 80:
-        return "A"
-    elif score >= 70:
-        return "B"
-    elif score >= 60:
-        return "C"
-    elif score >= 50:
-        return "D"
-    else:
-        return "F"
+    return get_rules().ladder("grade")(score)
 
 
 def get_confidence(completeness: float) -> str:
     """Determine confidence level based on data completeness."""
-    if completeness >= 70:
-        return "high"
-    elif completeness >= 40:
-        return "medium"
-    else:
-        return "low"
+    return get_rules().ladder("confidence")(completeness)
 
 
 # =============================================================================
@@ -517,14 +446,20 @@ def score_property(data: PropertyData) -> ScoreBreakdown:
     Returns ScoreBreakdown with all components and recommendations.
     """
     
-    breakdown = ScoreBreakdown()
-    
     # Calculate each component
-    floral = score_floral_resources(data)
-    nesting = score_nesting_habitat(data)
-    connectivity = score_connectivity(data)
-    management = score_management(data)
-    impervious = calculate_impervious_penalty(data)
+    components = {name: scorer(data) for name, scorer in COMPONENT_SCORERS.items()}
+    return assemble_breakdown(data, components)
+
+
+def assemble_breakdown(data: PropertyData, components: Dict) -> ScoreBreakdown:
+    """Sum component results (see COMPONENT_SCORERS) into a ScoreBreakdown."""
+    
+    breakdown = ScoreBreakdown()
+    floral = components["floral"]
+    nesting = components["nesting"]
+    connectivity = components["connectivity"]
+    management = components["management"]
+    impervious = components["impervious"]
     
     # Populate breakdown
     breakdown.floral_score = floral["total"]
@@ -563,6 +498,97 @@ def score_property(data: PropertyData) -> ScoreBreakdown:
     return breakdown
 
 
+# =============================================================================
+# INCREMENTAL SCORING
+# =============================================================================
+# Caches each property's component results with a fingerprint of the inputs
+# that component reads. Rescoring after a change (e.g. one plant added)
+# recomputes only components whose inputs changed, then re-sums.
+
+def _plant_fingerprint(plants):
+    return tuple(
+        (p.species, p.count, tuple(p.bloom_seasons), p.is_native, p.is_milkweed)
+        for p in plants
+    )
+
+
+# Component -> function of the PropertyData fields it reads
+COMPONENT_INPUTS = {
+    "floral": lambda d: (_plant_fingerprint(d.plants), d.estimated_flower_coverage_pct),
+    "nesting": lambda d: (d.has_bare_ground, d.bare_ground_sqft, d.has_dead_wood, d.has_bee_hotel,
+                          d.has_brush_pile, d.leaves_stems_over_winter, d.mowing_frequency),
+    "connectivity": lambda d: (d.neighbors_in_program, d.green_space_within_500m),
+    "management": lambda d: (d.uses_pesticides, d.pesticide_frequency,
+                             tuple(p.is_native for p in d.plants)),
+    "impervious": lambda d: (d.impervious_surface_pct,),
+}
+
+COMPONENT_SCORERS = {
+    "floral": score_floral_resources,
+    "nesting": score_nesting_habitat,
+    "connectivity": score_connectivity,
+    "management": score_management,
+    "impervious": calculate_impervious_penalty,
+}
+
+INCREMENTAL_CACHE_SIZE = 5000
+
+# property key -> {"rules": version, "inputs": {component: fingerprint}, "results": {component: result}}
+_component_cache = OrderedDict()
+_component_stats = {name: {"hits": 0, "misses": 0} for name in COMPONENT_SCORERS}
+_component_lock = threading.Lock()
+
+
+def score_property_incremental(key, data: PropertyData) -> ScoreBreakdown:
+    """
+    score_property for a property identified by key (e.g. (user_id, grid_hash)),
+    reusing cached component results whose inputs are unchanged.
+    A scoring rules reload invalidates every cached component.
+    """
+    rules_version = get_rules().version
+    with _component_lock:
+        cached = _component_cache.get(key)
+        if cached is not None:
+            _component_cache.move_to_end(key)
+            if cached["rules"] != rules_version:
+                cached = None
+    
+    inputs, results = {}, {}
+    for name, scorer in COMPONENT_SCORERS.items():
+        inputs[name] = COMPONENT_INPUTS[name](data)
+        if cached is not None and cached["inputs"][name] == inputs[name]:
+            results[name] = cached["results"][name]
+            hit = True
+        else:
+            results[name] = scorer(data)
+            hit = False
+        with _component_lock:
+            _component_stats[name]["hits" if hit else "misses"] += 1
+    
+    with _component_lock:
+        _component_cache[key] = {"rules": rules_version, "inputs": inputs, "results": results}
+        _component_cache.move_to_end(key)
+        while len(_component_cache) > INCREMENTAL_CACHE_SIZE:
+            _component_cache.popitem(last=False)
+    
+    return assemble_breakdown(data, results)
+
+
+def get_incremental_stats():
+    """Component cache hit/miss counters."""
+    with _component_lock:
+        components = {name: dict(counts) for name, counts in _component_stats.items()}
+        size = len(_component_cache)
+    hits = sum(c["hits"] for c in components.values())
+    lookups = hits + sum(c["misses"] for c in components.values())
+    return {
+        "properties_cached": size,
+        "max_properties": INCREMENTAL_CACHE_SIZE,
+        "components": components,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+    }
+
+
 # =============================================================================
 # TEST
 # =============================================================================
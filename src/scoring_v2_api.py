@@ -7,6 +7,53 @@ from scoring_v2 import (
     PropertyData, PlantInventory, Season,
     score_property, ScoreBreakdown
 )
+from score_optimizer import optimize_property, ACTIONS
+
+
+def property_from_json(data):
+    """Build PropertyData from a /api/v2/score style JSON body."""
+    # Parse plants
+    plants = []
+    for p in data.get('plants', []):
+        seasons = []
+        for s in p.get('bloom_seasons', []):
+            if s.lower() == 'spring':
+                seasons.append(Season.SPRING)
+            elif s.lower() == 'summer':
+                seasons.append(Season.SUMMER)
+            elif s.lower() == 'fall':
+                seasons.append(Season.FALL)
+        
+        plants.append(PlantInventory(
+            species=p.get('species', 'Unknown'),
+            count=p.get('count', 1),
+            bloom_seasons=seasons,
+            is_native=p.get('is_native', True),
+            is_milkweed=p.get('is_milkweed', False),
+        ))
+    
+    # Build PropertyData
+    prop = PropertyData(
+        lat=data['lat'],
+        lng=data['lng'],
+        grid_hash=f"{round(data['lat'], 3)}_{round(data['lng'], 3)}",
+        plants=plants,
+        estimated_flower_coverage_pct=data.get('flower_coverage_pct', 0),
+        has_bare_ground=data.get('has_bare_ground', False),
+        bare_ground_sqft=data.get('bare_ground_sqft', 0),
+        has_dead_wood=data.get('has_dead_wood', False),
+        has_brush_pile=data.get('has_brush_pile', False),
+        has_bee_hotel=data.get('has_bee_hotel', False),
+        leaves_stems_over_winter=data.get('leaves_stems_over_winter', False),
+        neighbors_in_program=data.get('neighbors_in_program', 0),
+        green_space_within_500m=data.get('green_space_within_500m', 0),
+        uses_pesticides=data.get('uses_pesticides', False),
+        pesticide_frequency=data.get('pesticide_frequency', 'never'),
+        mowing_frequency=data.get('mowing_frequency', 'weekly'),
+        lot_size_sqft=data.get('lot_size_sqft', 5000),
+        impervious_surface_pct=data.get('impervious_surface_pct', 30),
+    )
+    return prop
 
 
 def register_scoring_v2_routes(app):
@@ -48,47 +95,7 @@ def register_scoring_v2_routes(app):
         if 'lat' not in data or 'lng' not in data:
             return jsonify({"error": "lat and lng required"}), 400
         
-        # Parse plants
-        plants = []
-        for p in data.get('plants', []):
-            seasons = []
-            for s in p.get('bloom_seasons', []):
-                if s.lower() == 'spring':
-                    seasons.append(Season.SPRING)
-                elif s.lower() == 'summer':
-                    seasons.append(Season.SUMMER)
-                elif s.lower() == 'fall':
-                    seasons.append(Season.FALL)
-            
-            plants.append(PlantInventory(
-                species=p.get('species', 'Unknown'),
-                count=p.get('count', 1),
-                bloom_seasons=seasons,
-                is_native=p.get('is_native', True),
-                is_milkweed=p.get('is_milkweed', False),
-            ))
-        
-        # Build PropertyData
-        prop = PropertyData(
-            lat=data['lat'],
-            lng=data['lng'],
-            grid_hash=f"{round(data['lat'], 3)}_{round(data['lng'], 3)}",
-            plants=plants,
-            estimated_flower_coverage_pct=data.get('flower_coverage_pct', 0),
-            has_bare_ground=data.get('has_bare_ground', False),
-            bare_ground_sqft=data.get('bare_ground_sqft', 0),
-            has_dead_wood=data.get('has_dead_wood', False),
-            has_brush_pile=data.get('has_brush_pile', False),
-            has_bee_hotel=data.get('has_bee_hotel', False),
-            leaves_stems_over_winter=data.get('leaves_stems_over_winter', False),
-            neighbors_in_program=data.get('neighbors_in_program', 0),
-            green_space_within_500m=data.get('green_space_within_500m', 0),
-            uses_pesticides=data.get('uses_pesticides', False),
-            pesticide_frequency=data.get('pesticide_frequency', 'never'),
-            mowing_frequency=data.get('mowing_frequency', 'weekly'),
-            lot_size_sqft=data.get('lot_size_sqft', 5000),
-            impervious_surface_pct=data.get('impervious_surface_pct', 30),
-        )
+        prop = property_from_json(data)
         
         # Score it
         result = score_property(prop)
@@ -182,3 +189,47 @@ def register_scoring_v2_routes(app):
                 if r.get('priority') in ['critical', 'high']
             ][:3],
         })
+    
+    @app.route('/api/v2/optimize', methods=['POST'])
+    def optimize_property_v2():
+        """
+        What-if planner: best improvement plans for a property.
+        
+        POST /api/v2/optimize
+        Same body as /api/v2/score, plus optional:
+            "budget": 100,                         # max plan cost (USD)
+            "actions": ["add_milkweed", ...],      # limit candidate actions
+            "max_plans": 20
+        
+        Returns Pareto-optimal plans (no cheaper plan scores as high).
+        """
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({"error": "JSON body required"}), 400
+        
+        if 'lat' not in data or 'lng' not in data:
+            return jsonify({"error": "lat and lng required"}), 400
+        
+        try:
+            budget = float(data['budget']) if data.get('budget') is not None else None
+            max_plans = int(data.get('max_plans', 20))
+        except (TypeError, ValueError):
+            return jsonify({"error": "budget and max_plans must be numbers"}), 400
+        if max_plans < 0:
+            return jsonify({"error": "max_plans must be zero or more"}), 400
+        actions = data.get('actions')
+        if actions is not None and not (isinstance(actions, list) and all(isinstance(a, str) for a in actions)):
+            return jsonify({"error": "actions must be a list of action ids"}), 400
+        
+        result = optimize_property(property_from_json(data), action_ids=data.get('actions'),
+                                   budget=budget, max_plans=max_plans)
+        return jsonify(result)
+    
+    @app.route('/api/v2/optimize/actions', methods=['GET'])
+    def list_optimizer_actions():
+        """Candidate actions the optimizer can plan with."""
+        return jsonify({"actions": [
+            {"id": a["id"], "title": a["title"], "cost": a["cost"], "hours": a["hours"]}
+            for a in ACTIONS
+        ]})
@@ -8,8 +8,16 @@ import aiohttp
 import asyncio
 import ssl
 import certifi
-from flask import request, jsonify
+import os
+import threading
+import time
+from flask import request, jsonify, send_file
 from admin_auth import require_admin
+from supabase_reader import fetch_rows, iter_rows
+from export_stream import (
+    EXPORT_TABLES, drive, iter_table_pages, parse_export_args, text_chunks,
+    json_tables_chunks, export_response, start_export_job, get_export_job, resume_export_job,
+)
 from datetime import datetime, timedelta
 
 SUPABASE_URL = "https://gqexnqmqwhpcrleksrkb.supabase.co"
@@ -26,197 +34,268 @@ def _headers(token=None):
 
 async def get_table_count(table, filters=None):
     """Get count from a table with optional filters."""
+    counts = await collect_counts({"count": (table, filters)})
+    return counts["count"]
+
+
+# ============ COUNT COLLECTOR ============
+
+COUNT_MODES = ("exact", "planned", "estimated")
+COUNT_CACHE_TTL = 30  # seconds
+COUNT_CACHE_MAX = 256
+
+# Optional Postgres function that counts many queries in one call.
+# Called as POST /rest/v1/rpc/<name> {"queries": [{"key", "table", "filters"}]}
+# and expected to return {"<key>": <count>, ...}.
+COUNT_RPC = os.environ.get("STATS_COUNT_RPC")
+
+# Simple in-memory cache: (table, filters, mode) -> (count, timestamp)
+# Only successful counts are stored; expired entries are swept on write
+_count_cache = {}
+_count_lock = threading.Lock()
+
+
+def _count_from_range(header):
+    """Parse the total out of a Content-Range header like "*/42" (None if absent)."""
+    try:
+        return int((header or '').split('/')[-1])
+    except ValueError:
+        return None
+
+
+def _cache_counts(counts, now):
+    with _count_lock:
+        for key in [k for k, (_, at) in _count_cache.items() if now - at >= COUNT_CACHE_TTL]:
+            del _count_cache[key]
+        _count_cache.update((key, (count, now)) for key, count in counts.items())
+        # Still over the cap: drop the oldest
+        excess = max(0, len(_count_cache) - COUNT_CACHE_MAX)
+        for key in sorted(_count_cache, key=lambda k: _count_cache[k][1])[:excess]:
+            del _count_cache[key]
+
+
+async def _head_count(session, ssl_ctx, table, filters=None, mode="exact"):
+    """Count rows with a HEAD request - no rows are transferred."""
     url = f"{SUPABASE_URL}/rest/v1/{table}?select=id"
     if filters:
         url += f"&{filters}"
+    headers = _headers()
+    headers["Prefer"] = f"count={mode}"
+    async with session.head(url, headers=headers, ssl=ssl_ctx) as resp:
+        if resp.status not in (200, 206):
+            return None
+        return _count_from_range(resp.headers.get('content-range'))
+
+
+async def _rpc_counts(session, ssl_ctx, specs):
+    """Batch counts through COUNT_RPC. Returns None if the RPC is unavailable."""
+    url = f"{SUPABASE_URL}/rest/v1/rpc/{COUNT_RPC}"
+    payload = {"queries": [
+        {"key": name, "table": table, "filters": filters or ""}
+        for name, (table, filters) in specs.items()
+    ]}
+    async with session.post(url, headers=_headers(), ssl=ssl_ctx, json=payload) as resp:
+        if resp.status != 200:
+            return None
+        data = await resp.json()
+    if not isinstance(data, dict):
+        return None
+    return {name: int(data[name]) if data.get(name) is not None else None for name in specs}
+
+
+async def collect_counts(specs, mode="exact"):
+    """
+    Count several (table, filters) queries at once.
+    specs maps a result name to (table, filters). Fresh counts come from
+    the cache; the rest are fetched in one RPC when configured, otherwise
+    as concurrent HEAD requests on a shared session. A count that could
+    not be fetched is None (never cached, never reported as 0).
+    """
+    now = time.time()
+    results = {}
+    missing = {}
+    with _count_lock:
+        for name, (table, filters) in specs.items():
+            cached = _count_cache.get((table, filters, mode))
+            if cached and now - cached[1] < COUNT_CACHE_TTL:
+                results[name] = cached[0]
+            else:
+                missing[name] = (table, filters)
     
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            # Count is in content-range header
-            range_header = resp.headers.get('content-range', '*/0')
-            try:
-                count = int(range_header.split('/')[-1])
-                return count
-            except:
-                data = await resp.json()
-                return len(data) if resp.status == 200 else 0
-
-
-async def get_system_stats():
-    """Get comprehensive system statistics."""
-    stats = {}
+    if missing:
+        ssl_ctx = _ssl_context()
+        async with aiohttp.ClientSession() as session:
+            fetched = None
+            if COUNT_RPC:
+                try:
+                    fetched = await _rpc_counts(session, ssl_ctx, missing)
+                except (aiohttp.ClientError, ValueError):
+                    fetched = None
+            if fetched is None:
+                names = list(missing)
+                counts = await asyncio.gather(
+                    *(_head_count(session, ssl_ctx, *missing[name], mode=mode) for name in names),
+                    return_exceptions=True,
+                )
+                fetched = {
+                    name: None if isinstance(count, Exception) else count
+                    for name, count in zip(names, counts)
+                }
+        results.update(fetched)
+        _cache_counts({
+            (*missing[name], mode): count for name, count in fetched.items() if count is not None
+        }, now)
     
+    return {name: results[name] for name in specs}
+
+
+SYSTEM_COUNTS = {
     # User counts
-    stats['total_users'] = await get_table_count('plant_inventories', 'select=user_id')
-    
+    'total_users': ('profiles', None),  # one row per account
     # Plant data
-    stats['total_plants'] = await get_table_count('plant_inventories')
-    stats['total_species'] = await get_table_count('species')
-    
+    'total_plants': ('plant_inventories', None),
+    'total_species': ('species', None),
     # Assessments
-    stats['total_assessments'] = await get_table_count('habitat_assessments')
-    
+    'total_assessments': ('habitat_assessments', None),
     # Observations
-    stats['total_observations'] = await get_table_count('observations')
-    stats['pending_observations'] = await get_table_count('observations', 'status=eq.pending')
-    stats['verified_observations'] = await get_table_count('observations', 'status=eq.verified')
-    
+    'total_observations': ('observations', None),
+    'pending_observations': ('observations', 'status=eq.pending'),
+    'verified_observations': ('observations', 'status=eq.verified'),
     # Challenges
-    stats['total_challenges'] = await get_table_count('challenges')
-    stats['active_challenges'] = await get_table_count('challenges', 'status=eq.active')
-    stats['completed_challenges'] = await get_table_count('challenges', 'status=eq.completed')
-    
+    'total_challenges': ('challenges', None),
+    'active_challenges': ('challenges', 'status=eq.active'),
+    'completed_challenges': ('challenges', 'status=eq.completed'),
     # Referrals
-    stats['total_referrals'] = await get_table_count('referrals')
-    stats['successful_referrals'] = await get_table_count('referrals', 'status=eq.joined')
-    
+    'total_referrals': ('referrals', None),
+    'successful_referrals': ('referrals', 'status=eq.joined'),
     # Badges
-    stats['badges_awarded'] = await get_table_count('user_badges')
-    
+    'badges_awarded': ('user_badges', None),
     # Scores
-    stats['users_with_scores'] = await get_table_count('user_scores')
-    
-    return stats
+    'users_with_scores': ('user_scores', None),
+}
+
 
+def _growth_cutoff(days):
+    # Truncated to 10 minutes so repeated calls share cached counts
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    return cutoff.replace(minute=cutoff.minute - cutoff.minute % 10, second=0, microsecond=0).isoformat()
 
-async def get_growth_stats(days=30):
+
+def growth_counts(cutoff):
+    return {
+        'new_assessments': ('habitat_assessments', f'submitted_at=gte.{cutoff}'),
+        'new_observations': ('observations', f'created_at=gte.{cutoff}'),
+        'new_referrals_joined': ('referrals', f'joined_at=gte.{cutoff}&status=eq.joined'),
+        'new_badges': ('user_badges', f'earned_at=gte.{cutoff}'),
+    }
+
+
+async def get_system_stats(mode="exact"):
+    """Get comprehensive system statistics."""
+    return await collect_counts(SYSTEM_COUNTS, mode)
+
+
+async def get_growth_stats(days=30, mode="exact"):
     """Get growth metrics over time period."""
-    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-    
-    stats = {
+    cutoff = _growth_cutoff(days)
+    counts = await collect_counts(growth_counts(cutoff), mode)
+    return {
         "period_days": days,
         "cutoff_date": cutoff,
+        **counts,
     }
-    
-    # New assessments
-    stats['new_assessments'] = await get_table_count(
-        'habitat_assessments', 
-        f'submitted_at=gte.{cutoff}'
-    )
-    
-    # New observations
-    stats['new_observations'] = await get_table_count(
-        'observations',
-        f'created_at=gte.{cutoff}'
-    )
-    
-    # New referrals joined
-    stats['new_referrals_joined'] = await get_table_count(
-        'referrals',
-        f'joined_at=gte.{cutoff}&status=eq.joined'
-    )
-    
-    # New badges
-    stats['new_badges'] = await get_table_count(
-        'user_badges',
-        f'earned_at=gte.{cutoff}'
-    )
-    
-    return stats
 
 
 async def get_geographic_stats():
     """Get stats by geographic area."""
-    async with aiohttp.ClientSession() as session:
-        # Get unique grid hashes with counts
-        url = f"{SUPABASE_URL}/rest/v1/plant_inventories?select=grid_hash"
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                grids = {}
-                for row in data:
-                    gh = row.get('grid_hash', 'unknown')
-                    grids[gh] = grids.get(gh, 0) + 1
-                
-                return {
-                    "unique_grids": len(grids),
-                    "top_grids": sorted(grids.items(), key=lambda x: x[1], reverse=True)[:10],
-                }
-    return {}
+    # Get unique grid hashes with counts
+    grids = {}
+    async for row in iter_rows("plant_inventories", select="id,grid_hash"):
+        gh = row.get('grid_hash', 'unknown')
+        grids[gh] = grids.get(gh, 0) + 1
+    
+    return {
+        "unique_grids": len(grids),
+        "top_grids": sorted(grids.items(), key=lambda x: x[1], reverse=True)[:10],
+    }
 
 
 async def get_score_distribution():
     """Get distribution of scores."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SUPABASE_URL}/rest/v1/user_scores?select=total_score,grade"
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            if resp.status == 200:
-                scores = await resp.json()
-                
-                if not scores:
-                    return {"count": 0}
-                
-                score_values = [s['total_score'] for s in scores if s.get('total_score')]
-                
-                # Grade distribution
-                grades = {}
-                for s in scores:
-                    g = s.get('grade', 'Unknown')
-                    grades[g] = grades.get(g, 0) + 1
-                
-                return {
-                    "count": len(scores),
-                    "average": sum(score_values) / len(score_values) if score_values else 0,
-                    "min": min(score_values) if score_values else 0,
-                    "max": max(score_values) if score_values else 0,
-                    "grade_distribution": grades,
-                }
-    return {}
+    scores = await fetch_rows("user_scores", select="id,total_score,grade")
+    
+    if not scores:
+        return {"count": 0}
+    
+    score_values = [s['total_score'] for s in scores if s.get('total_score')]
+    
+    # Grade distribution
+    grades = {}
+    for s in scores:
+        g = s.get('grade', 'Unknown')
+        grades[g] = grades.get(g, 0) + 1
+    
+    return {
+        "count": len(scores),
+        "average": sum(score_values) / len(score_values) if score_values else 0,
+        "min": min(score_values) if score_values else 0,
+        "max": max(score_values) if score_values else 0,
+        "grade_distribution": grades,
+    }
 
 
 async def get_challenge_stats():
     """Get challenge participation stats."""
-    async with aiohttp.ClientSession() as session:
-        url = f"{SUPABASE_URL}/rest/v1/challenges?select=id,name,goal_type,goal_target,current_progress,status"
-        async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-            if resp.status == 200:
-                challenges = await resp.json()
-                
-                # Completion rates
-                completed = [c for c in challenges if c.get('status') == 'completed']
-                active = [c for c in challenges if c.get('status') == 'active']
-                
-                # Progress on active
-                active_progress = []
-                for c in active:
-                    target = c.get('goal_target', 1)
-                    progress = c.get('current_progress', 0)
-                    pct = (progress / target * 100) if target > 0 else 0
-                    active_progress.append({
-                        "name": c.get('name'),
-                        "progress_pct": round(pct, 1),
-                        "goal_type": c.get('goal_type'),
-                    })
-                
-                return {
-                    "total": len(challenges),
-                    "completed": len(completed),
-                    "active": len(active),
-                    "completion_rate": (len(completed) / len(challenges) * 100) if challenges else 0,
-                    "active_challenges": sorted(active_progress, key=lambda x: x['progress_pct'], reverse=True),
-                }
-    return {}
-
-
-async def export_all_data():
-    """Export all data for backup/analysis."""
-    data = {}
-    tables = [
-        'plant_inventories', 'species', 'habitat_assessments',
-        'observations', 'challenges', 'challenge_participants',
-        'referrals', 'user_badges', 'user_scores', 'score_history'
-    ]
+    challenges = await fetch_rows(
+        "challenges", select="id,name,goal_type,goal_target,current_progress,status")
+    
+    # Completion rates
+    completed = [c for c in challenges if c.get('status') == 'completed']
+    active = [c for c in challenges if c.get('status') == 'active']
     
-    async with aiohttp.ClientSession() as session:
-        for table in tables:
-            url = f"{SUPABASE_URL}/rest/v1/{table}?limit=10000"
-            async with session.get(url, headers=_headers(), ssl=_ssl_context()) as resp:
-                if resp.status == 200:
-                    data[table] = await resp.json()
-                else:
-                    data[table] = []
+    # Progress on active
+    active_progress = []
+    for c in active:
+        target = c.get('goal_target', 1)
+        progress = c.get('current_progress', 0)
+        pct = (progress / target * 100) if target > 0 else 0
+        active_progress.append({
+            "name": c.get('name'),
+            "progress_pct": round(pct, 1),
+            "goal_type": c.get('goal_type'),
+        })
     
-    return data
+    return {
+        "total": len(challenges),
+        "completed": len(completed),
+        "active": len(active),
+        "completion_rate": (len(completed) / len(challenges) * 100) if challenges else 0,
+        "active_challenges": sorted(active_progress, key=lambda x: x['progress_pct'], reverse=True),
+    }
+
+
+async def export_all_data(tables=None):
+    """Export all data for backup/analysis (paged; prefer the streaming route for large tables)."""
+    tables = tables or EXPORT_TABLES
+    results = await asyncio.gather(*(fetch_rows(table) for table in tables))
+    return dict(zip(tables, results))
+
+
+def _export_tables():
+    """Tables named in ?tables=a,b (defaults to every exportable table)."""
+    names = request.args.get('tables')
+    if not names:
+        return EXPORT_TABLES, None
+    tables = [t.strip() for t in names.split(',') if t.strip()]
+    unknown = [t for t in tables if t not in EXPORT_TABLES]
+    if unknown:
+        return None, f"Unknown tables: {', '.join(unknown)}"
+    return tables, None
+
+
+def _count_mode():
+    mode = request.args.get('count', 'exact')
+    return mode if mode in COUNT_MODES else 'exact'
 
 
 def register_stats_routes(app):
@@ -224,8 +303,8 @@ def register_stats_routes(app):
     
     @app.route('/api/stats', methods=['GET'])
     def get_stats():
-        """Get system-wide statistics."""
-        stats = asyncio.run(get_system_stats())
+        """Get system-wide statistics. ?count=exact|planned|estimated"""
+        stats = asyncio.run(get_system_stats(_count_mode()))
         return jsonify({
             "generated_at": datetime.utcnow().isoformat(),
             "stats": stats
@@ -235,7 +314,7 @@ def register_stats_routes(app):
     def get_growth():
         """Get growth metrics."""
         days = request.args.get('days', 30, type=int)
-        stats = asyncio.run(get_growth_stats(days))
+        stats = asyncio.run(get_growth_stats(days, _count_mode()))
         return jsonify(stats)
     
     @app.route('/api/stats/geographic', methods=['GET'])
@@ -260,29 +339,101 @@ def register_stats_routes(app):
     @require_admin
     def admin_export():
         """
-        Export all system data.
-        TODO: Add admin auth check.
+        Stream all system data, one page at a time.
+        ?format=json|ndjson|csv  &gzip=1  &tables=a,b
+        Resume with ?start_table=<table>&offset=<rows already received>.
         """
-        data = asyncio.run(export_all_data())
-        return jsonify({
-            "exported_at": datetime.utcnow().isoformat(),
-            "tables": list(data.keys()),
-            "data": data
-        })
+        opts, error = parse_export_args(request.args)
+        if error:
+            return jsonify({"error": error}), 400
+        tables, error = _export_tables()
+        if error:
+            return jsonify({"error": error}), 400
+        if opts["format"] == "csv" and len(tables) != 1:
+            return jsonify({"error": "csv export needs exactly one table (?tables=name)"}), 400
+        if opts["start_table"] and opts["start_table"] not in tables:
+            return jsonify({"error": "start_table must be one of the exported tables"}), 400
+
+        pages = drive(iter_table_pages(tables, opts["start_table"], opts["after"], offset=opts["offset"]))
+        stamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        if opts["format"] == "json":
+            head = {"exported_at": datetime.utcnow().isoformat(), "tables": tables}
+            if opts["start_table"]:
+                head["tables"] = tables[tables.index(opts["start_table"]):]
+            chunks = json_tables_chunks(head, pages, head["tables"])
+        else:
+            chunks = text_chunks(pages, opts["format"], multi_table=len(tables) > 1)
+        return export_response(chunks, opts["format"], f"export_{stamp}.{opts['format']}", opts["gzip"])
+    
+    @app.route('/api/admin/export/jobs', methods=['POST'])
+    @require_admin
+    def admin_export_job():
+        """Start a background export to a local file. Body: {tables, format, gzip}"""
+        data = request.get_json(silent=True) or {}
+        fmt = data.get('format', 'ndjson')
+        if fmt not in ('ndjson', 'csv'):
+            return jsonify({"error": "File exports support ndjson or csv"}), 400
+        tables = data.get('tables') or EXPORT_TABLES
+        unknown = [t for t in tables if t not in EXPORT_TABLES]
+        if unknown:
+            return jsonify({"error": f"Unknown tables: {', '.join(unknown)}"}), 400
+        if fmt == "csv" and len(tables) != 1:
+            return jsonify({"error": "csv export needs exactly one table"}), 400
+        job = start_export_job(tables, fmt, data.get('gzip', True))
+        return jsonify(job), 202
+    
+    @app.route('/api/admin/export/jobs/<job_id>', methods=['GET'])
+    @require_admin
+    def admin_export_job_status(job_id):
+        """Progress of a file export (table, offset, rows, bytes)."""
+        job = get_export_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job)
+    
+    @app.route('/api/admin/export/jobs/<job_id>/resume', methods=['POST'])
+    @require_admin
+    def admin_export_job_resume(job_id):
+        """Resume an interrupted or failed file export from its checkpoint."""
+        job = resume_export_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job), 202
+    
+    @app.route('/api/admin/export/jobs/<job_id>/download', methods=['GET'])
+    @require_admin
+    def admin_export_job_download(job_id):
+        """Download a finished file export."""
+        job = get_export_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+        if job["status"] != "complete":
+            return jsonify({"error": f"Job is {job['status']}"}), 409
+        return send_file(os.path.abspath(job["path"]), as_attachment=True)
     
     @app.route('/api/stats/dashboard', methods=['GET'])
     def dashboard_stats():
         """Combined stats for admin dashboard."""
+        mode = _count_mode()
+        
         async def gather_all():
-            system = await get_system_stats()
-            growth = await get_growth_stats(30)
-            scores = await get_score_distribution()
-            challenges = await get_challenge_stats()
-            geo = await get_geographic_stats()
+            # Every count goes out in one batch alongside the row reads
+            cutoff = _growth_cutoff(30)
+            specs = {**SYSTEM_COUNTS, **growth_counts(cutoff)}
+            counts, scores, challenges, geo = await asyncio.gather(
+                collect_counts(specs, mode),
+                get_score_distribution(),
+                get_challenge_stats(),
+                get_geographic_stats(),
+            )
             
             return {
-                "system": system,
-                "growth_30d": growth,
+                "system": {name: counts[name] for name in SYSTEM_COUNTS},
+                "growth_30d": {
+                    "period_days": 30,
+                    "cutoff_date": cutoff,
+                    **{name: counts[name] for name in specs if name not in SYSTEM_COUNTS},
+                },
                 "scores": scores,
                 "challenges": challenges,
                 "geographic": geo,
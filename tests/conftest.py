@@ -0,0 +1,12 @@
+"""
+Offline tests for the modules in src/ (imported flat, as the app does).
+test_api.py is a live harness against the deployed API - run it as a
+script (python tests/test_api.py); pytest leaves it out.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+collect_ignore = ["test_api.py"]
@@ -69,14 +69,20 @@ def test_public_endpoints():
     test("GET /api/species/plants", status == 200)
     status, data = get("/api/scoring/methodology")
     test("GET /api/scoring/methodology", status == 200)
+    status, data = get("/api/scoring/rules")
+    test("GET /api/scoring/rules", status == 200 and "version" in data)
     status, data = get("/api/badges")
     test("GET /api/badges", status == 200)
     status, data = get("/api/challenges")
     test("GET /api/challenges", status == 200)
+    status, data = post("/api/challenges/1/contribute", {"amount": 1})
+    test("POST /api/challenges/<id>/contribute requires auth", status == 401)
     status, data = get("/api/observations")
     test("GET /api/observations", status == 200)
     status, data = get("/api/stats")
     test("GET /api/stats", status == 200)
+    status, data = get("/api/inaturalist/observations")
+    test("GET /api/inaturalist/observations requires username", status == 400)
 
 
 def test_scoring_endpoints():
@@ -89,6 +95,15 @@ def test_scoring_endpoints():
     status, data = post("/api/v2/score", payload)
     test("POST /api/v2/score", status == 200)
     test("Score has score field", isinstance(data, dict) and "score" in data)
+    status, data = post("/api/v2/optimize", {**payload, "budget": 50})
+    test("POST /api/v2/optimize", status == 200 and "plans" in data)
+    status, data = post("/api/scores/recalculate", {})
+    test("POST /api/scores/recalculate requires auth", status == 401)
+    status, data = get("/api/scores/queue")
+    test("GET /api/scores/queue", status == 200 and "pending" in data)
+    test("Queue stats include component cache", isinstance(data, dict) and "component_cache" in data)
+    status, data = post("/api/scores/rescore", {})
+    test("POST /api/scores/rescore requires admin key", status == 403)
 
 
 def test_admin_endpoints():
@@ -99,6 +114,10 @@ def test_admin_endpoints():
     test("Admin verify with key succeeds", status == 200)
     status, data = get("/api/admin/export", headers=admin_headers())
     test("GET /api/admin/export", status == 200)
+    status, data = get("/api/admin/export?format=ndjson&tables=species&offset=10", headers=admin_headers())
+    test("GET /api/admin/export (ndjson, offset)", status == 200)
+    status, data = get("/api/admin/export?format=xml", headers=admin_headers())
+    test("Admin export rejects unknown format", status == 400)
 
 
 def test_jobs_endpoints():
@@ -107,6 +126,10 @@ def test_jobs_endpoints():
     test("GET /api/jobs/list", status == 200)
     status, data = get("/api/jobs/history")
     test("GET /api/jobs/history", status == 200)
+    status, data = get("/api/jobs/schedule")
+    test("GET /api/jobs/schedule requires admin key", status == 403)
+    status, data = get("/api/jobs/schedule", headers=admin_headers())
+    test("GET /api/jobs/schedule", status == 200 and "expire_challenges" in data.get("jobs", {}))
 
 
 def test_stats_endpoints():
@@ -115,6 +138,8 @@ def test_stats_endpoints():
     test("GET /api/stats/growth", status == 200)
     status, data = get("/api/stats/dashboard")
     test("GET /api/stats/dashboard", status == 200)
+    status, data = get("/api/stats?count=estimated")
+    test("GET /api/stats (estimated counts)", status == 200 and "total_plants" in data.get("stats", {}))
 
 
 def test_events_endpoints():
@@ -123,6 +148,8 @@ def test_events_endpoints():
     test("GET /api/events/types", status == 200)
     status, data = get("/api/events/daily?days=7")
     test("GET /api/events/daily", status == 200)
+    status, data = get("/api/events/buffer", headers=admin_headers())
+    test("GET /api/events/buffer", status == 200 and "pending" in data)
 
 
 def test_government_endpoints():
@@ -136,10 +163,21 @@ def test_government_endpoints():
     test("GET /api/gov/priority-areas", status == 200)
     status, data = get("/api/gov/geojson/participation")
     test("GET /api/gov/geojson/participation", status == 200)
+    status, data = get("/api/gov/snapshot")
+    test("GET /api/gov/snapshot", status == 200)
+    test("Snapshot is loaded", isinstance(data, dict) and data.get("loaded") is True)
     status, data = get("/api/gov/report/council", headers=admin_headers())
     test("GET /api/gov/report/council", status == 200)
 
 
+def test_connectivity_endpoints():
+    print("\n📋 Connectivity Endpoints")
+    status, data = get("/api/connectivity/nearby?grid_hash=40.666_-111.897&radius=2")
+    test("GET /api/connectivity/nearby (radius)", status == 200 and len(data.get("nearby_grids", [])) == 25)
+    status, data = get("/api/connectivity/nearby")
+    test("Nearby requires grid_hash", status == 400)
+
+
 def test_external_data_endpoints():
     print("\n📋 External Data Endpoints")
     status, data = get("/api/external/sources")
@@ -159,6 +197,12 @@ def test_unified_map_endpoints():
     test("Unified has features", isinstance(data, dict) and "features" in data)
     status, data = get("/api/map/bloom-calendar")
     test("GET /api/map/bloom-calendar", status == 200)
+    status, data = get("/api/map/properties?bounds=-111.95,40.60,-111.80,40.72")
+    test("GET /api/map/properties (bounds)", status == 200)
+    status, data = get("/api/map/observations?city=Murray&limit=50")
+    test("GET /api/map/observations (city)", status == 200)
+    test("Filtered observations match city", isinstance(data, dict) and all(
+        f["properties"].get("city") == "Murray" for f in data.get("features", [])))
 
 
 def test_enhanced_map_endpoints():
@@ -233,6 +277,7 @@ if __name__ == "__main__":
     test_stats_endpoints()
     test_events_endpoints()
     test_government_endpoints()
+    test_connectivity_endpoints()
     test_external_data_endpoints()
     test_unified_map_endpoints()
     test_enhanced_map_endpoints()
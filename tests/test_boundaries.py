@@ -0,0 +1,54 @@
+"""Boundary polygons: point-in-polygon lookups and the latitude-band fallback."""
+
+import json
+
+import pytest
+
+import boundaries
+
+
+def square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+@pytest.fixture
+def wards(tmp_path):
+    # One ward with a hole, plus a MultiPolygon ward
+    features = [
+        {"type": "Feature", "properties": {"ward": "Ward 1"},
+         "geometry": {"type": "Polygon", "coordinates": [
+             square(-112.0, 40.6, -111.9, 40.7), square(-111.96, 40.64, -111.94, 40.66)]}},
+        {"type": "Feature", "properties": {"NAME": "Ward 2"},
+         "geometry": {"type": "MultiPolygon", "coordinates": [
+             [square(-111.9, 40.6, -111.8, 40.7)], [square(-111.7, 40.6, -111.6, 40.7)]]}},
+    ]
+    (tmp_path / "wards.geojson").write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    boundaries.load_boundaries(str(tmp_path))
+    yield
+    boundaries.load_boundaries(str(tmp_path / "none"))
+
+
+def test_point_in_polygon(wards):
+    assert boundaries.lookup_point(40.62, -111.98)["ward"] == "Ward 1"
+    assert boundaries.lookup_point(40.62, -111.85)["ward"] == "Ward 2"
+    assert boundaries.lookup_point(40.62, -111.65)["ward"] == "Ward 2"
+    assert "ward" in boundaries.lookup_point(40.62, -111.65)["resolved"]
+
+
+def test_hole_and_outside_use_layer_default(wards):
+    assert boundaries.lookup_point(40.65, -111.95)["ward"] == boundaries.LAYER_DEFAULTS["ward"]
+    assert boundaries.lookup_point(41.5, -111.95)["resolved"] == []
+
+
+def test_layers_without_files_fall_back_to_bands(wards):
+    result = boundaries.lookup_point(40.62, -111.98)
+    assert "city" not in result["resolved"]
+    assert result["city"] == boundaries._band_city(40.62, -111.98)
+
+
+def test_reload_clears_memo_and_bumps_version(wards, tmp_path):
+    boundaries.lookup_grid("40.62_-111.98")
+    version = boundaries.get_boundary_version()
+    boundaries.load_boundaries(str(tmp_path))
+    assert boundaries.get_boundary_version() == version + 1
+    assert boundaries.get_boundary_stats()["memoized_grids"] == 0
@@ -0,0 +1,74 @@
+"""Cron parsing and job leases (no scheduler thread)."""
+
+from datetime import datetime
+
+import pytest
+
+import job_scheduler
+from job_scheduler import CronSchedule, JobLease
+
+
+def test_cron_fields():
+    cron = CronSchedule("*/15 6-8 1,15 * *")
+    assert cron.minutes == {0, 15, 30, 45}
+    assert cron.hours == {6, 7, 8}
+    assert cron.days == {1, 15}
+    assert cron.matches(datetime(2026, 3, 15, 7, 30))
+    assert not cron.matches(datetime(2026, 3, 15, 9, 30))
+    assert not cron.matches(datetime(2026, 3, 14, 7, 30))
+
+
+def test_cron_step_from_start():
+    assert CronSchedule("5/20 * * * *").minutes == {5, 25, 45}
+
+
+def test_cron_sunday_is_0_or_7():
+    # 2026-10-18 is a Sunday
+    sunday = datetime(2026, 10, 18, 12, 0)
+    assert CronSchedule("0 12 * * 0").matches(sunday)
+    assert CronSchedule("0 12 * * 7").matches(sunday)
+    assert not CronSchedule("0 12 * * 1").matches(sunday)
+
+
+def test_cron_restricted_day_fields_match_either():
+    cron = CronSchedule("0 0 1 * 1")
+    assert cron.matches(datetime(2026, 10, 1, 0, 0))   # the 1st (a Thursday)
+    assert cron.matches(datetime(2026, 10, 19, 0, 0))  # a Monday
+
+
+def test_cron_next_after():
+    cron = CronSchedule("0 6 1,15 8 *")
+    assert cron.next_after(datetime(2026, 8, 1, 6, 0)) == datetime(2026, 8, 15, 6, 0)
+    assert cron.next_after(datetime(2026, 8, 20, 0, 0)) == datetime(2027, 8, 1, 6, 0)
+    assert CronSchedule("0 0 31 2 *").next_after(datetime(2026, 1, 1)) is None
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "5-1 * * * *", "*/0 * * * *"])
+def test_cron_rejects_bad_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_scheduler, "JOBS_STATE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_lease_slots_are_exclusive(state_dir):
+    first, second, third = JobLease("job", slots=2), JobLease("job", slots=2), JobLease("job", slots=2)
+    assert first.acquire("test") and second.acquire("test")
+    assert not third.acquire("test")
+    assert len(job_scheduler.lease_status("job", 2)) == 2
+    first.release()
+    assert third.acquire("test")
+    second.release()
+    third.release()
+    assert job_scheduler.lease_status("job", 2) == []
+
+
+def test_scheduled_minute_runs_once(state_dir):
+    lease = JobLease("job")
+    assert lease.claim_minute("2026-10-18T15:00:00")
+    assert not JobLease("job").claim_minute("2026-10-18T15:00:00")
+    assert JobLease("job").claim_minute("2026-10-18T15:01:00")
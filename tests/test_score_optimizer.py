@@ -0,0 +1,59 @@
+"""What-if optimizer: plans are scored exactly as score_property would score them."""
+
+import dataclasses
+
+import pytest
+
+from score_optimizer import ACTIONS, optimize_property
+from scoring_v2 import PropertyData, score_property
+
+
+def prop(**kwargs):
+    return PropertyData(lat=40.666, lng=-111.897, **kwargs)
+
+
+def plan_score(result, actions):
+    return next(p["score"] for p in result["plans"] if p["actions"] == actions)
+
+
+@pytest.mark.parametrize("mowing", ["daily", "weekly", ""])
+def test_reduce_mowing_scores_like_score_property(mowing):
+    data = prop(mowing_frequency=mowing)
+    result = optimize_property(data, action_ids=["reduce_mowing"])
+    expected = score_property(dataclasses.replace(data, mowing_frequency="rarely")).final_score
+    assert plan_score(result, ["reduce_mowing"]) == round(expected, 1)
+
+
+def test_reduce_mowing_not_offered_when_never_mowing():
+    result = optimize_property(prop(mowing_frequency="never"), action_ids=["reduce_mowing"])
+    assert result["actions"] == []
+
+
+def test_stop_pesticides_scores_like_score_property():
+    data = prop(uses_pesticides=True, pesticide_frequency="")
+    result = optimize_property(data, action_ids=["stop_pesticides"])
+    expected = score_property(dataclasses.replace(
+        data, uses_pesticides=False, pesticide_frequency="never")).final_score
+    assert plan_score(result, ["stop_pesticides"]) == round(expected, 1)
+
+
+def test_empty_action_list_evaluates_nothing():
+    result = optimize_property(prop(), action_ids=[])
+    assert result["scenarios"] == 1
+    assert result["actions"] == []
+
+
+def test_plans_are_pareto_optimal_within_budget():
+    result = optimize_property(prop(), budget=100)
+    plans = result["plans"]
+    assert plans and all(p["cost"] <= 100 for p in plans)
+    # Cheaper first, and every extra dollar buys a higher score
+    assert [p["cost"] for p in plans] == sorted(p["cost"] for p in plans)
+    assert all(a["score"] < b["score"] for a, b in zip(plans, plans[1:]))
+    assert result["scenarios"] <= 2 ** len(ACTIONS)
+
+
+@pytest.mark.parametrize("kwargs", [{"action_ids": "reduce_mowing"}, {"max_plans": -1}])
+def test_rejects_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        optimize_property(prop(), **kwargs)
@@ -0,0 +1,43 @@
+"""Batch scorer vs scoring_v2.score_property, field by field and bit for bit."""
+
+import random
+
+from scoring_batch import compare_with_scalar
+from scoring_v2 import PlantInventory, PropertyData, Season
+
+FREQUENCIES = ["never", "rarely", "sometimes", "often"]
+MOWINGS = ["weekly", "biweekly", "monthly", "rarely"]
+
+
+def random_property(rng):
+    plants = [
+        PlantInventory(
+            f"plant{j}", rng.randint(0, 6),
+            rng.sample(list(Season), rng.randint(0, 3)),
+            is_native=rng.random() < 0.7, is_milkweed=rng.random() < 0.2)
+        for j in range(rng.randint(0, 14))
+    ]
+    return PropertyData(
+        lat=40.666, lng=-111.897, plants=plants,
+        estimated_flower_coverage_pct=rng.choice([0, 5, 9.99, 10, 20, 29.5, 30, rng.uniform(0, 60)]),
+        has_bare_ground=rng.random() < 0.5,
+        bare_ground_sqft=rng.choice([0, 10, 25, 50, rng.uniform(0, 80)]),
+        has_dead_wood=rng.random() < 0.4, has_brush_pile=rng.random() < 0.4,
+        has_bee_hotel=rng.random() < 0.4, leaves_stems_over_winter=rng.random() < 0.5,
+        neighbors_in_program=rng.randint(0, 8),
+        green_space_within_500m=rng.choice([0, 5, 10, 20, 30, rng.uniform(0, 50)]),
+        uses_pesticides=rng.random() < 0.5, pesticide_frequency=rng.choice(FREQUENCIES),
+        mowing_frequency=rng.choice(MOWINGS),
+        lot_size_sqft=rng.choice([5000, rng.uniform(1000, 20000)]),
+        impervious_surface_pct=rng.choice([22, 30, rng.uniform(0, 90)]),
+    )
+
+
+def test_batch_matches_scalar_scores():
+    rng = random.Random(42)
+    properties = [random_property(rng) for _ in range(20000)]
+    assert compare_with_scalar(properties)[:10] == []
+
+
+def test_batch_matches_scalar_for_defaults():
+    assert compare_with_scalar([PropertyData(lat=40.666, lng=-111.897)]) == []
@@ -0,0 +1,27 @@
+"""Compiled scoring rules."""
+
+import pytest
+
+from scoring_rules import RULES_PATH, Ladder, compile_rules
+
+
+def test_ladder_takes_highest_threshold_met():
+    ladder = Ladder("coverage", 0, [[5, 2], [10, 4], [20, 6]])
+    assert [ladder(x) for x in (0, 4.99, 5, 9.99, 10, 20, 100)] == [0, 0, 2, 2, 4, 6, 6]
+
+
+def test_ladder_rejects_duplicate_thresholds():
+    with pytest.raises(ValueError):
+        Ladder("bad", 0, [[5, 1], [5, 2]])
+
+
+def test_shipped_rules_compile():
+    with open(RULES_PATH) as f:
+        rules = compile_rules(f.read())
+    assert rules.impervious_penalty(rules.impervious["threshold_pct"]) == 0
+    assert rules.impervious_penalty(100) == -rules.impervious["max_penalty"]
+
+
+def test_missing_section_is_rejected():
+    with pytest.raises(ValueError):
+        compile_rules("model_version: '1'\nladders: {}\n")
@@ -0,0 +1,35 @@
+"""Keyset pagination filters."""
+
+from urllib.parse import unquote
+
+from supabase_reader import _keyset_filter, _order_columns, keyset_cursor
+
+
+def test_single_column_key():
+    assert _keyset_filter(_order_columns("id"), [42]) == "id=gt.42"
+    assert _keyset_filter(_order_columns("id.desc"), [42]) == "id=lt.42"
+
+
+def test_compound_key():
+    columns = _order_columns("assessment_date.desc,id")
+    assert columns == [("assessment_date", True), ("id", False)]
+    assert unquote(_keyset_filter(columns, ["2026-10-01", 7])) == (
+        'or=(or(assessment_date.lt."2026-10-01",assessment_date.is.null),'
+        'and(assessment_date.eq."2026-10-01",id.gt."7"))')
+
+
+def test_compound_key_after_null():
+    # Nothing sorts after a null (nulls last) - only the tie-breaker can advance
+    columns = _order_columns("user_id,id")
+    assert unquote(_keyset_filter(columns, [None, 7])) == 'or=(and(user_id.is.null,id.gt."7"))'
+
+
+def test_values_are_quoted_for_logic_trees():
+    filter_ = unquote(_keyset_filter(_order_columns("name,id"), ['a,b"(c)', 1]))
+    assert 'name.gt."a,b\\"(c)"' in filter_
+
+
+def test_keyset_cursor():
+    row = {"user_id": "u1", "id": 9, "other": 1}
+    assert keyset_cursor(row) == 9
+    assert keyset_cursor(row, "user_id,id") == ["u1", 9]